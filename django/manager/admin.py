@@ -10,6 +10,7 @@ from manager.models import (
     SeazoneCommission,
     HostCommission,
     OwnerCommission,
+    CommissionRollup,
 )
 from property_rental.admin import property_rental_admin as admin_site
 
@@ -26,3 +27,4 @@ admin_site.register(Reservation, BaseAdmin)
 admin_site.register(SeazoneCommission, BaseAdmin)
 admin_site.register(HostCommission, BaseAdmin)
 admin_site.register(OwnerCommission, BaseAdmin)
+admin_site.register(CommissionRollup, BaseAdmin)
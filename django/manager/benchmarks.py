@@ -0,0 +1,241 @@
+# Base imports
+import io
+import os
+import platform
+import random
+import resource
+import statistics
+import time
+import timeit
+import tracemalloc
+from contextlib import contextmanager
+from urllib.parse import quote
+
+# Django imports
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Max, Min
+from django.test import Client
+from django.utils import timezone
+
+# Third party imports
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Project imports
+from authentication.models import User
+from manager.models import Host, Owner, Property, Reservation, SeazoneCommission
+from shared.cache import get_response_cache
+from shared.parsers import ORJSONParser
+from shared.renderers import ORJSONRenderer
+
+
+BENCHMARK_USERNAME = 'benchmark'
+
+# name: path, the fields are filled from a random reservation on every request: its property and
+# city, the period of the same length right after it, and the year and month it ends.
+BENCHMARK_ENDPOINTS = {
+    'properties_list': '/v1/properties/?page_size=50',
+    'properties_list_city': '/v1/properties/?page_size=50&address_city={city}&location_match=exact',
+    'reservations_list': '/v1/reservations/?page_size=50',
+    'property_availability': (
+        '/v1/properties/availability/?property_id={property_id}&start_date={start_date}'
+        '&end_date={end_date}&guests_quantity=1'
+    ),
+    'commissions': '/v1/financial/commissions/?type=host',
+    'commissions_month': '/v1/financial/commissions/?type=host&year={year}&month={month}',
+}
+
+
+@contextmanager
+def count_queries(connection):
+    """ Counts the queries run on a connection in the block, without the debug cursor. """
+    counter = {'queries': 0}
+
+    def counting(execute, sql, params, many, context):
+        counter['queries'] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counting):
+        yield counter
+
+
+def percentile(values, percent):
+    """ Nearest rank percentile of sorted values. """
+    return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+
+class BenchmarkRunner:
+    """
+    Requests the API endpoints in-process through the test client, as a staff user with a JWT,
+    and reports per endpoint the latency percentiles, the SQL queries per request and the peak
+    Python memory allocated by one request.
+
+    Latency and queries are measured without tracemalloc, the memory in a separate pass.
+    Without ``response_cache`` the response cache is cleared before every request.
+    """
+
+    def __init__(self, endpoints=None, requests=200, warmup=10, response_cache=False, seed=0,
+                 using=DEFAULT_DB_ALIAS):
+        self.endpoints = endpoints or BENCHMARK_ENDPOINTS
+        self.requests = requests
+        self.warmup = warmup
+        self.response_cache = response_cache
+        self.random = random.Random(seed)
+        self.connection = connections[using]
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {self.get_token()}')
+        self.samples = self.get_samples()
+
+    @staticmethod
+    def get_token():
+        user, _created = User.objects.get_or_create(
+            username=BENCHMARK_USERNAME,
+            defaults={'email': f'{BENCHMARK_USERNAME}@example.com', 'is_staff': True, 'is_superuser': True}
+        )
+        return RefreshToken.for_user(user).access_token
+
+    def get_samples(self):
+        """
+        Reservations whose property, dates and month parametrize the requests, picked by random
+        ids so large tables are not sorted.
+        """
+        id_range = Reservation.objects.aggregate(first_id=Min('id'), last_id=Max('id'))
+        if id_range['first_id'] is None:
+            return []
+        ids = [self.random.randint(id_range['first_id'], id_range['last_id']) for _ in range(100)]
+        return list(
+            Reservation.objects.filter(id__in=ids).order_by('id').values_list(
+                'property_id', 'property__city_key', 'start_date', 'end_date'
+            )
+        )
+
+    def get_path(self, template):
+        if not self.samples:
+            return template.format(property_id=0, city='', start_date='', end_date='', year='', month='')
+        property_id, city, start_date, end_date = self.random.choice(self.samples)
+        return template.format(
+            property_id=property_id,
+            city=quote(city),
+            start_date=end_date,
+            end_date=end_date + (end_date - start_date),
+            year=end_date.year,
+            month=end_date.month,
+        )
+
+    def request(self, path):
+        if not self.response_cache:
+            get_response_cache().clear()
+        return self.client.get(path, HTTP_ACCEPT='application/json')
+
+    def run_endpoint(self, template):
+        for _ in range(self.warmup):
+            self.request(self.get_path(template))
+
+        latencies = []
+        queries = []
+        statuses = {}
+        for _ in range(self.requests):
+            path = self.get_path(template)
+            with count_queries(self.connection) as counter:
+                start = time.perf_counter()
+                response = self.request(path)
+                latencies.append(time.perf_counter() - start)
+            queries.append(counter['queries'])
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        tracemalloc.start()
+        try:
+            peaks = []
+            for _ in range(min(self.requests, 10)):
+                path = self.get_path(template)
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                self.request(path)
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'path': template,
+            'requests': self.requests,
+            'statuses': statuses,
+            'latency_ms': {
+                'min': round(latencies[0] * 1000, 3),
+                'p50': round(percentile(latencies, 50) * 1000, 3),
+                'p90': round(percentile(latencies, 90) * 1000, 3),
+                'p95': round(percentile(latencies, 95) * 1000, 3),
+                'p99': round(percentile(latencies, 99) * 1000, 3),
+                'max': round(latencies[-1] * 1000, 3),
+                'mean': round(statistics.fmean(latencies) * 1000, 3),
+            },
+            'queries': {'min': min(queries), 'max': max(queries), 'mean': round(statistics.fmean(queries), 2)},
+            'peak_memory_kb': round(max(peaks) / 1024, 1),
+        }
+
+    def run(self):
+        results = {name: self.run_endpoint(template) for name, template in self.endpoints.items()}
+        return {
+            'created_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'database': self.connection.vendor,
+                'pid': os.getpid(),
+                'response_cache': self.response_cache,
+            },
+            'rows': {
+                model._meta.db_table: model.objects.count()
+                for model in (Owner, Host, Property, Reservation, SeazoneCommission)
+            },
+            'endpoints': results,
+            # ru_maxrss is in kilobytes on Linux.
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def compare_results(previous, current):
+    """ Ratio of the current to the previous p50 and p95 latencies and mean queries per endpoint. """
+    comparison = {}
+    for name, result in current['endpoints'].items():
+        previous_result = previous.get('endpoints', {}).get(name)
+        if previous_result is None:
+            continue
+        comparison[name] = {
+            f'{metric}_ratio': round(result['latency_ms'][metric] / previous_result['latency_ms'][metric], 3)
+            if previous_result['latency_ms'][metric] else None
+            for metric in ('p50', 'p95')
+        }
+        comparison[name]['queries_mean'] = [previous_result['queries']['mean'], result['queries']['mean']]
+    return comparison
+
+
+def benchmark_json_codecs(rows=1000, repeat=20):
+    """
+    Best time of DRF's JSON renderer and parser and of the orjson ones on a page of the
+    reservation list, read through the API, and whether both render the same bytes.
+    """
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {BenchmarkRunner.get_token()}')
+    get_response_cache().clear()
+    response = client.get(f'/v1/reservations/?page_size={rows}', HTTP_ACCEPT='application/json')
+    data = response.data
+
+    def best_ms(function):
+        return round(min(timeit.repeat(function, number=1, repeat=repeat)) * 1000, 3)
+
+    results = {'rows': len(data['results']), 'repeat': repeat}
+    rendered = {}
+    for name, renderer in (('stdlib', JSONRenderer()), ('orjson', ORJSONRenderer())):
+        rendered[name] = renderer.render(data, 'application/json')
+        results[name] = {
+            'render_ms': best_ms(lambda: renderer.render(data, 'application/json')),
+            'parse_ms': None,
+        }
+    for name, parser_class in (('stdlib', JSONParser), ('orjson', ORJSONParser)):
+        parser = parser_class()
+        results[name]['parse_ms'] = best_ms(lambda: parser.parse(io.BytesIO(rendered['stdlib'])))
+
+    results['bytes'] = len(rendered['stdlib'])
+    results['identical_output'] = rendered['stdlib'] == rendered['orjson']
+    results['render_speedup'] = round(results['stdlib']['render_ms'] / results['orjson']['render_ms'], 2)
+    results['parse_speedup'] = round(results['stdlib']['parse_ms'] / results['orjson']['parse_ms'], 2)
+    return results
@@ -0,0 +1,158 @@
+# Django imports
+from django.db import transaction
+from django.utils import timezone
+
+# Project imports
+from manager.models import (
+    CommissionTypeChoices,
+    HostCommission,
+    OwnerCommission,
+    SeazoneCommission,
+    StatusChoices,
+)
+from manager.rollups import COMMISSION_MODELS, apply_rollup_deltas, commission_rollup_deltas
+from shared.money import (
+    BASIS_POINTS,
+    apply_basis_points,
+    from_basis_points,
+    from_minor_units,
+    to_basis_points,
+    to_minor_units,
+)
+
+
+def split_commission_units(total_units, seazone_basis_points, host_basis_points):
+    """
+    Splits a total price in cents in the seazone, host and owner commissions, in cents.
+
+    The owner gets what is left after the seazone and host commissions.
+    """
+    seazone_units = apply_basis_points(total_units, seazone_basis_points)
+    host_units = apply_basis_points(total_units, host_basis_points)
+    return seazone_units, host_units, total_units - seazone_units - host_units
+
+
+def calculate_commission_values(total_price, property_instance):
+    """
+    Splits a total price in the seazone, host and owner commission values, computed in integer
+    cents from the basis point rates of the property.
+    """
+    return tuple(
+        from_minor_units(units)
+        for units in split_commission_units(
+            to_minor_units(total_price),
+            to_basis_points(property_instance.seazone_commission),
+            to_basis_points(property_instance.host_commission),
+        )
+    )
+
+
+def owner_commission_percent(property_instance):
+    """ Rate left to the owner after the seazone and host commissions, exact in basis points. """
+    return from_basis_points(
+        BASIS_POINTS
+        - to_basis_points(property_instance.seazone_commission)
+        - to_basis_points(property_instance.host_commission)
+    )
+
+
+def create_commissions(reservations, update_rollups=True):
+    """
+    Creates the seazone, host and owner commissions of saved reservations, one bulk INSERT per
+    commission table, and adds the confirmed ones to the monthly rollups unless update_rollups
+    is False (bulk loads rebuild the rollups once at the end). Cancelled reservations get zeroed
+    commissions.
+
+    The property of each reservation must already be loaded, its host and owner are never fetched.
+    """
+    seazone_commissions = []
+    host_commissions = []
+    owner_commissions = []
+    for reservation in reservations:
+        property_instance = reservation.property
+        reservation_date = reservation.end_date
+        seazone_commission_value, host_commission_value, owner_commission_value = calculate_commission_values(
+            reservation.total_price if reservation.status == StatusChoices.CONFIRMED else 0, property_instance
+        )
+        seazone_commissions.append(SeazoneCommission(
+            reservation=reservation,
+            reservation_date=reservation_date,
+            commission_percent=property_instance.seazone_commission,
+            commission_value=seazone_commission_value
+        ))
+        host_commissions.append(HostCommission(
+            reservation=reservation,
+            reservation_date=reservation_date,
+            commission_percent=property_instance.host_commission,
+            commission_value=host_commission_value,
+            host_id=property_instance.host_id
+        ))
+        owner_commissions.append(OwnerCommission(
+            reservation=reservation,
+            reservation_date=reservation_date,
+            commission_percent=owner_commission_percent(property_instance),
+            commission_value=owner_commission_value,
+            owner_id=property_instance.owner_id
+        ))
+
+    typed_commissions = [
+        (commission_type, commission)
+        for commission_type, commissions in (
+            (CommissionTypeChoices.SEAZONE, seazone_commissions),
+            (CommissionTypeChoices.HOST, host_commissions),
+            (CommissionTypeChoices.OWNER, owner_commissions),
+        )
+        for commission in commissions
+        if commission.reservation.status == StatusChoices.CONFIRMED
+    ]
+    with transaction.atomic(savepoint=False):
+        SeazoneCommission.objects.bulk_create(seazone_commissions)
+        HostCommission.objects.bulk_create(host_commissions)
+        OwnerCommission.objects.bulk_create(owner_commissions)
+        if update_rollups:
+            apply_rollup_deltas(commission_rollup_deltas(typed_commissions))
+
+
+def cancel_commissions(reservation):
+    """
+    Takes the commissions of a reservation that is no longer confirmed out of the monthly
+    rollups and zeroes them, a cancelled reservation earns no commission.
+    """
+    typed_commissions = [
+        (commission_type, commission)
+        for commission_type, model in COMMISSION_MODELS.items()
+        for commission in model.objects.filter(reservation=reservation)
+    ]
+    for _commission_type, commission in typed_commissions:
+        commission.reservation = reservation
+
+    with transaction.atomic(savepoint=False):
+        apply_rollup_deltas(commission_rollup_deltas(typed_commissions, direction=-1))
+        for model in COMMISSION_MODELS.values():
+            model.objects.filter(reservation=reservation).update(commission_value=0, updated_at=timezone.now())
+
+
+def remove_commissions(reservation):
+    """
+    Takes the commissions of a reservation about to be deleted out of the monthly rollups,
+    before they are deleted with it. Those of a cancelled reservation were taken out already.
+    """
+    if reservation.status != StatusChoices.CONFIRMED:
+        return
+
+    typed_commissions = [
+        (commission_type, commission)
+        for commission_type, model in COMMISSION_MODELS.items()
+        for commission in model.objects.filter(reservation=reservation)
+    ]
+    for _commission_type, commission in typed_commissions:
+        commission.reservation = reservation
+    apply_rollup_deltas(commission_rollup_deltas(typed_commissions, direction=-1))
+
+
+def regenerate_commissions(reservation):
+    """ Generates again the commissions of a reservation confirmed again after a cancellation. """
+    with transaction.atomic(savepoint=False):
+        for model in COMMISSION_MODELS.values():
+            model.objects.filter(reservation=reservation).delete()
+        create_commissions([reservation])
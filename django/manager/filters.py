@@ -1,21 +1,60 @@
 # Base imports
 import django_filters.rest_framework
+from django_filters.constants import EMPTY_VALUES
 
 # Project imports
-from manager.models import Property, Reservation
+from manager.models import Property, Reservation, location_key
+
+
+LOCATION_MATCH_CHOICES = (
+    ('contains', 'contains'),
+    ('exact', 'exact'),
+    ('prefix', 'prefix'),
+)
+
+
+class LocationFilter(django_filters.CharFilter):
+    """
+    Location filter following the ``location_match`` parameter of the filterset: ``exact`` and
+    ``prefix`` compare the normalized location key, using its index, ``contains`` (the default)
+    searches the address field as typed.
+    """
+
+    def __init__(self, key_field_name, *args, **kwargs):
+        self.key_field_name = key_field_name
+        super().__init__(*args, lookup_expr='icontains', **kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        location_match = self.parent.form.cleaned_data.get('location_match')
+        if location_match == 'exact':
+            return qs.filter(**{self.key_field_name: location_key(value)})
+        if location_match == 'prefix':
+            return qs.filter(**{f'{self.key_field_name}__startswith': location_key(value)})
+        return super().filter(qs, value)
 
 
 class PropertyFilter(django_filters.FilterSet):
     property_id = django_filters.NumberFilter(field_name='id', lookup_expr='exact')
-    address_neighborhood = django_filters.CharFilter(field_name='address_neighborhood', lookup_expr='icontains')
-    address_city = django_filters.CharFilter(field_name='address_city', lookup_expr='icontains')
-    address_state = django_filters.CharFilter(field_name='address_state', lookup_expr='icontains')
+    address_neighborhood = LocationFilter('neighborhood_key', field_name='address_neighborhood')
+    address_city = LocationFilter('city_key', field_name='address_city')
+    address_state = LocationFilter('state_key', field_name='address_state')
+    country = django_filters.CharFilter(field_name='country', lookup_expr='exact')
+    location_match = django_filters.ChoiceFilter(choices=LOCATION_MATCH_CHOICES, method='filter_location_match')
     capacity = django_filters.NumberFilter(field_name='capacity', lookup_expr='gte')
     price_per_night = django_filters.NumberFilter(field_name='price_per_night', lookup_expr='lte')
 
     class Meta:
         model = Property
-        fields = ['property_id', 'address_neighborhood', 'address_city', 'address_state', 'capacity', 'price_per_night']
+        fields = [
+            'property_id', 'address_neighborhood', 'address_city', 'address_state', 'country', 'location_match',
+            'capacity', 'price_per_night'
+        ]
+
+    def filter_location_match(self, queryset, name, value):
+        # Read by the location filters.
+        return queryset
 
 
 class ReservationFilter(django_filters.FilterSet):
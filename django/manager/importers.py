@@ -0,0 +1,192 @@
+# Base imports
+import csv
+import json
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+
+# Django imports
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+
+# Project imports
+from manager.commissions import create_commissions
+from manager.models import Property, Reservation, StatusChoices
+from manager.occupancy import invalidate_property_occupancy
+from manager.serializers import ReservationImportSerializer
+
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+def read_import_rows(lines, import_format):
+    """
+    Yields (row number, row) from the lines of a CSV file with a header or of a NDJSON file.
+    """
+    if import_format == 'csv':
+        yield from enumerate(csv.DictReader(lines), start=1)
+        return
+
+    row_number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row_number, row if isinstance(row, dict) else None
+
+
+class ReservationImporter:
+    """
+    Imports reservations in chunks: each chunk is validated with one query for its properties
+    and one for the reservations it could overlap, then written with bulk INSERTs together with
+    its commissions. Invalid rows are reported and skipped, the valid rows of the chunk are
+    still imported.
+    """
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+
+    def run(self, rows, start_row=0, on_checkpoint=None):
+        """
+        Imports the (row number, row) pairs after start_row. on_checkpoint is called with the
+        last row number of every committed chunk.
+        """
+        result = {'imported': 0, 'errors': [], 'last_row': start_row}
+        rows = ((row_number, row) for row_number, row in rows if row_number > start_row)
+
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            imported, errors = self.import_chunk(chunk)
+            result['imported'] += imported
+            result['errors'].extend(errors)
+            result['last_row'] = chunk[-1][0]
+            if on_checkpoint:
+                on_checkpoint(result['last_row'])
+
+        return result
+
+    def import_chunk(self, chunk):
+        errors = []
+        valid_rows = []
+        for row_number, row in chunk:
+            if row is None:
+                errors.append({'row': row_number, 'errors': {'errors': [_("Invalid row.")]}})
+                continue
+            serializer = ReservationImportSerializer(data=row)
+            if serializer.is_valid():
+                valid_rows.append((row_number, serializer.validated_data))
+            else:
+                errors.append({'row': row_number, 'errors': serializer.errors})
+
+        properties = Property.objects.in_bulk({data['property'] for _row_number, data in valid_rows})
+        reservations = []
+        for row_number, data in valid_rows:
+            property_instance = properties.get(data['property'])
+            if property_instance is None:
+                errors.append({'row': row_number, 'errors': {'property': [_("Property not found.")]}})
+            elif data['guests_quantity'] > property_instance.capacity:
+                errors.append({'row': row_number, 'errors': {'errors': [
+                    _("The number of guests exceeds the maximum capacity of the property.")
+                ]}})
+            else:
+                reservations.append((row_number, Reservation(
+                    property=property_instance,
+                    client_name=data['client_name'],
+                    client_email=data['client_email'],
+                    start_date=data['start_date'],
+                    end_date=data['end_date'],
+                    guests_quantity=data['guests_quantity'],
+                    status=data['status'],
+                    total_price=Reservation.calculate_total_price(
+                        property_instance.price_per_night, data['start_date'], data['end_date']
+                    ),
+                )))
+
+        reservations, overlap_errors = self.reject_overlapping(reservations)
+        errors.extend(overlap_errors)
+
+        imported, insert_errors = self.insert(reservations)
+        errors.extend(insert_errors)
+        errors.sort(key=lambda error: error['row'])
+        return imported, errors
+
+    @staticmethod
+    def reject_overlapping(reservations):
+        """
+        Rejects the confirmed reservations overlapping a stored confirmed reservation or an earlier
+        row of the chunk, reading the stored periods once instead of querying per row.
+        """
+        confirmed = [
+            (row_number, reservation) for row_number, reservation in reservations
+            if reservation.status == StatusChoices.CONFIRMED
+        ]
+        if not confirmed:
+            return reservations, []
+
+        # Sorted, non-overlapping (start_date, end_date) periods of each property, the accepted
+        # rows are added to them in row order.
+        periods = defaultdict(list)
+        for property_id, start_date, end_date in Reservation.objects.filter(
+            property_id__in={reservation.property_id for _row_number, reservation in confirmed},
+        ).overlapping(
+            min(reservation.start_date for _row_number, reservation in confirmed),
+            max(reservation.end_date for _row_number, reservation in confirmed),
+        ).order_by('start_date').values_list('property_id', 'start_date', 'end_date'):
+            periods[property_id].append((start_date, end_date))
+
+        rejected = set()
+        for row_number, reservation in confirmed:
+            # The periods never overlap each other, so the one starting last before the new end
+            # date is the only one that can overlap.
+            property_periods = periods[reservation.property_id]
+            index = bisect_left(property_periods, (reservation.end_date,))
+            if index > 0 and property_periods[index - 1][1] > reservation.start_date:
+                rejected.add(row_number)
+            else:
+                property_periods.insert(index, (reservation.start_date, reservation.end_date))
+
+        return (
+            [(row_number, reservation) for row_number, reservation in reservations if row_number not in rejected],
+            [
+                {'row': row_number, 'errors': {'errors': [_("The property is not available for the selected dates.")]}}
+                for row_number in sorted(rejected)
+            ]
+        )
+
+    @staticmethod
+    def insert(reservations):
+        """
+        Writes the reservations and their commissions in one transaction. If the database rejects
+        the batch, because of a reservation written meanwhile, the rows are retried one by one.
+        """
+        if not reservations:
+            return 0, []
+
+        try:
+            with transaction.atomic():
+                created = Reservation.objects.bulk_create([reservation for _row_number, reservation in reservations])
+                create_commissions(created)
+            imported, errors = len(created), []
+        except IntegrityError:
+            imported, errors = 0, []
+            for row_number, reservation in reservations:
+                reservation.pk = None
+                try:
+                    with transaction.atomic():
+                        created = Reservation.objects.bulk_create([reservation])
+                        create_commissions(created)
+                    imported += 1
+                except IntegrityError:
+                    errors.append({'row': row_number, 'errors': {'errors': [
+                        _("The property is not available for the selected dates.")
+                    ]}})
+
+        for property_id in {reservation.property_id for _row_number, reservation in reservations}:
+            invalidate_property_occupancy(property_id)
+        return imported, errors
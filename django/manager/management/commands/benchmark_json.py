@@ -0,0 +1,29 @@
+# Base imports
+import json
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from manager.benchmarks import benchmark_json_codecs
+from manager.models import Reservation
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSON renderer and parser with the orjson ones on a page of the reservation "
+        "list (see seed_data), and checks that both render the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Reservations in the page.')
+        parser.add_argument('--repeat', type=int, default=20, help='Timings per codec, the best is kept.')
+
+    def handle(self, *args, **options):
+        if Reservation.objects.count() < options['rows']:
+            raise CommandError(f'Needs at least {options["rows"]} reservations, run seed_data first.')
+
+        results = benchmark_json_codecs(rows=options['rows'], repeat=options['repeat'])
+        self.stdout.write(json.dumps(results, indent=2))
+        if not results['identical_output']:
+            raise CommandError('The renderers do not render the same bytes.')
@@ -0,0 +1,60 @@
+# Base imports
+import json
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+# Project imports
+from manager.query_plans import explain_hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports the EXPLAIN plan of the hot queries and the index serving each one. Fails when a '
+        'query is not served by its index.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--analyze', action='store_true', help='Run the queries, EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL.'
+        )
+        parser.add_argument('--format', dest='report_format', choices=('text', 'json'), default='text')
+        parser.add_argument('--output', help='File where the report is written, standard output by default.')
+
+    def handle(self, *args, **options):
+        report = explain_hot_queries(using=options['database'], analyze=options['analyze'])
+
+        if options['report_format'] == 'json':
+            content = json.dumps(report, indent=2, default=str)
+        else:
+            content = self.format_text(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(content + '\n')
+        else:
+            self.stdout.write(content)
+
+        missing = [query['name'] for query in report['queries'] if not query['index_used']]
+        if missing:
+            raise CommandError(f'Not served by their index: {", ".join(missing)}.')
+
+    @staticmethod
+    def format_text(report):
+        lines = [
+            f'Database: {report["vendor"]}',
+            'Rows: ' + ', '.join(f'{table} {rows}' for table, rows in report['rows'].items()),
+            'Sample: ' + ', '.join(f'{key}={value}' for key, value in report['sample'].items()),
+        ]
+        for query in report['queries']:
+            lines += [
+                '',
+                f'== {query["name"]}: {query["description"]}',
+                f'Expected index: {" or ".join(query["expected_indexes"]) or "-"}',
+                f'Index used: {query["index_used"] or "NONE"}',
+                query['sql'],
+                query['plan'],
+            ]
+        return '\n'.join(lines)
@@ -0,0 +1,63 @@
+# Base imports
+import json
+import os
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from manager.importers import IMPORT_FORMATS, ReservationImporter, read_import_rows
+
+
+class Command(BaseCommand):
+    help = 'Imports reservations, with their commissions, from a CSV (with header) or NDJSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument(
+            '--format', dest='import_format', choices=IMPORT_FORMATS,
+            help='File format, guessed from the file extension by default.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and written at once.')
+        parser.add_argument(
+            '--checkpoint', help='File where the last imported row is saved after every chunk.'
+        )
+        parser.add_argument(
+            '--resume', action='store_true', help='Skip the rows already imported according to the checkpoint.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if import_format == 'jsonl':
+            import_format = 'ndjson'
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(f'Unknown format, use --format {" or ".join(IMPORT_FORMATS)}.')
+
+        checkpoint = options['checkpoint']
+        if options['resume'] and not checkpoint:
+            raise CommandError('--resume requires --checkpoint.')
+
+        start_row = 0
+        if options['resume'] and os.path.exists(checkpoint):
+            with open(checkpoint) as checkpoint_file:
+                start_row = json.load(checkpoint_file)['last_row']
+
+        def save_checkpoint(last_row):
+            if checkpoint:
+                with open(checkpoint, 'w') as checkpoint_file:
+                    json.dump({'path': path, 'last_row': last_row}, checkpoint_file)
+
+        with open(path, newline='', encoding='utf-8') as import_file:
+            result = ReservationImporter(chunk_size=options['chunk_size']).run(
+                read_import_rows(import_file, import_format),
+                start_row=start_row,
+                on_checkpoint=save_checkpoint
+            )
+
+        for error in result['errors']:
+            self.stderr.write(json.dumps(error, default=str))
+        self.stdout.write(self.style.SUCCESS(
+            f'{result["imported"]} reservations imported, {len(result["errors"])} rows rejected, '
+            f'last row {result["last_row"]}.'
+        ))
@@ -0,0 +1,23 @@
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from manager.rollups import rebuild_commission_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the monthly commission rollups from the commission tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Only rebuild the rollups of this year and --month.')
+        parser.add_argument('--month', type=int, help='Only rebuild the rollups of this month and --year.')
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        if bool(year) != bool(month):
+            raise CommandError('Use --year and --month together.')
+        try:
+            total_rollups = rebuild_commission_rollups(year=year, month=month)
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(f'{total_rollups} commission rollups rebuilt.'))
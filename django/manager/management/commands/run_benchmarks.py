@@ -0,0 +1,53 @@
+# Base imports
+import json
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from manager.benchmarks import BENCHMARK_ENDPOINTS, BenchmarkRunner, compare_results
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the API endpoints in-process against the current database (see seed_data) and '
+        'writes the latency percentiles, queries per request and peak memory as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint', action='append', dest='endpoints', choices=sorted(BENCHMARK_ENDPOINTS),
+            help='Endpoint to benchmark, repeatable. All by default.'
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint.')
+        parser.add_argument(
+            '--response-cache', action='store_true', help='Keep the response cache between requests.'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the request parameters.')
+        parser.add_argument('--output', help='File where the JSON results are written, standard output by default.')
+        parser.add_argument('--compare', help='Results of a previous run to compare with.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1.')
+
+        endpoints = {name: BENCHMARK_ENDPOINTS[name] for name in options['endpoints'] or BENCHMARK_ENDPOINTS}
+        results = BenchmarkRunner(
+            endpoints=endpoints,
+            requests=options['requests'],
+            warmup=options['warmup'],
+            response_cache=options['response_cache'],
+            seed=options['seed'],
+        ).run()
+
+        if options['compare']:
+            with open(options['compare']) as previous_file:
+                results['comparison'] = compare_results(json.load(previous_file), results)
+
+        content = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(content + '\n')
+        else:
+            self.stdout.write(content)
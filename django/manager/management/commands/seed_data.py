@@ -0,0 +1,44 @@
+# Base imports
+import json
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+# Project imports
+from manager.seeding import DataSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates owners, hosts, properties, reservations and their commissions with bulk INSERTs. '
+        'The same --seed and volumes generate the same data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owners', type=int, default=100)
+        parser.add_argument('--hosts', type=int, default=50)
+        parser.add_argument('--properties', type=int, default=1000)
+        parser.add_argument('--reservations', type=int, default=20000, help='Total, spread over the properties.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--start-date', default='2023-01-01', help='First reservation dates, YYYY-MM-DD.')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT.')
+
+    def handle(self, *args, **options):
+        start_date = parse_date(options['start_date'])
+        if start_date is None:
+            raise CommandError('Use --start-date YYYY-MM-DD.')
+        if min(options['owners'], options['hosts']) < 1 and options['properties']:
+            raise CommandError('Properties need at least one owner and one host.')
+
+        result = DataSeeder(
+            owners=options['owners'],
+            hosts=options['hosts'],
+            properties=options['properties'],
+            reservations=options['reservations'],
+            seed=options['seed'],
+            start_date=start_date,
+            batch_size=options['batch_size'],
+            stdout=self.stdout if options['verbosity'] > 1 else None,
+        ).run()
+        self.stdout.write(json.dumps(result))
@@ -0,0 +1,115 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:24
+
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+# The rollup rebuild, defined here with the models taken from an app registry: the migration
+# backfills with the historical models and manager.rollups rebuilds with the current ones.
+COMMISSION_MODEL_NAMES = {
+    'seazone': 'SeazoneCommission',
+    'host': 'HostCommission',
+    'owner': 'OwnerCommission',
+}
+
+
+def month_bounds(year, month):
+    """
+    Half-open [first day, first day of the next month) range of a month. Filtering the dates
+    against it, instead of extracting their year and month, lets the date indexes serve it.
+    """
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start_date, end_date
+
+
+def commission_rollup_rows(model, start_date=None, end_date=None):
+    """
+    Commission totals of the confirmed reservations of a commission model, grouped by property,
+    year and month, optionally for the reservation dates in [start_date, end_date).
+    """
+    commissions = model.objects.filter(reservation__status='Confirmed')
+    if start_date and end_date:
+        commissions = commissions.filter(reservation_date__gte=start_date, reservation_date__lt=end_date)
+
+    return commissions.annotate(
+        rollup_year=ExtractYear('reservation_date'),
+        rollup_month=ExtractMonth('reservation_date'),
+    ).values(
+        'reservation__property_id', 'rollup_year', 'rollup_month'
+    ).annotate(
+        rollup_total_commission=Sum('commission_value'),
+        rollup_total_reservations=Count('id'),
+    ).order_by()
+
+
+def rebuild_commission_rollups(apps, year=None, month=None):
+    """
+    Rebuilds the monthly rollups from the commissions of the confirmed reservations, every
+    rollup or only the ones of a month.
+    """
+    CommissionRollup = apps.get_model('manager', 'CommissionRollup')
+    rollups = CommissionRollup.objects.all()
+    start_date = end_date = None
+    if year and month:
+        start_date, end_date = month_bounds(year, month)
+        rollups = rollups.filter(year=year, month=month)
+
+    new_rollups = []
+    for commission_type, model_name in COMMISSION_MODEL_NAMES.items():
+        new_rollups.extend(
+            CommissionRollup(
+                commission_type=commission_type,
+                property_id=row['reservation__property_id'],
+                year=row['rollup_year'],
+                month=row['rollup_month'],
+                total_commission=row['rollup_total_commission'],
+                total_reservations=row['rollup_total_reservations'],
+            )
+            for row in commission_rollup_rows(
+                apps.get_model('manager', model_name), start_date=start_date, end_date=end_date
+            )
+        )
+
+    with transaction.atomic():
+        rollups.delete()
+        CommissionRollup.objects.bulk_create(new_rollups, batch_size=1000)
+
+    return len(new_rollups)
+
+
+def populate_commission_rollups(apps, schema_editor):
+    rebuild_commission_rollups(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommissionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('commission_type', models.CharField(choices=[('seazone', 'Seazone'), ('host', 'Host'), ('owner', 'Owner')], max_length=10)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('total_commission', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_reservations', models.IntegerField(default=0)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='commission_rollups', to='manager.property')),
+            ],
+            options={
+                'ordering': ('id',),
+                'constraints': [models.UniqueConstraint(fields=('commission_type', 'year', 'month', 'property'), name='unique_commission_rollup_period')],
+            },
+        ),
+        migrations.RunPython(populate_commission_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+from manager.triggers import drop_reservation_overlap_triggers_sql, reservation_overlap_triggers_sql
+from shared.db import VendorRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0002_commissionrollup'),
+    ]
+
+    operations = [
+        # CreateExtension queries pg_extension when unapplied, even on other databases.
+        VendorRunSQL(
+            'postgresql',
+            sql='CREATE EXTENSION IF NOT EXISTS btree_gist',
+            reverse_sql='DROP EXTENSION IF EXISTS btree_gist',
+        ),
+        VendorRunSQL(
+            'postgresql',
+            sql=[
+                "CREATE INDEX manager_reservation_period_gist ON manager_reservation "
+                "USING gist (property_id, daterange(start_date, end_date, '[)'))",
+                "ALTER TABLE manager_reservation ADD CONSTRAINT manager_reservation_no_overlap "
+                "EXCLUDE USING gist (property_id WITH =, daterange(start_date, end_date, '[)') WITH &&) "
+                "WHERE (status = 'Confirmed')",
+            ],
+            reverse_sql=[
+                "ALTER TABLE manager_reservation DROP CONSTRAINT manager_reservation_no_overlap",
+                "DROP INDEX manager_reservation_period_gist",
+            ],
+        ),
+        VendorRunSQL(
+            'sqlite',
+            sql=[
+                "CREATE INDEX manager_reservation_period ON manager_reservation "
+                "(property_id, start_date, end_date)",
+                *reservation_overlap_triggers_sql(),
+            ],
+            reverse_sql=[
+                *drop_reservation_overlap_triggers_sql(),
+                "DROP INDEX manager_reservation_period",
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+from manager.triggers import SEARCH_COLUMNS, drop_search_triggers_sql, search_triggers_sql
+from shared.db import VendorRunSQL
+
+
+def trigram_indexes_sql():
+    # Same expression as the icontains lookups: UPPER("column"::text) LIKE UPPER(%s).
+    return [
+        f"CREATE INDEX {table}_{column}_trgm ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)"
+        for table, columns in SEARCH_COLUMNS.items() for column in columns
+    ]
+
+
+def drop_trigram_indexes_sql():
+    return [
+        f"DROP INDEX {table}_{column}_trgm"
+        for table, columns in SEARCH_COLUMNS.items() for column in columns
+    ]
+
+
+def search_tables_sql():
+    sql = []
+    for table, columns in SEARCH_COLUMNS.items():
+        search_table = f'{table}_search'
+        sql += [
+            f"CREATE VIRTUAL TABLE {search_table} USING fts5({', '.join(columns)}, content='{table}', "
+            f"content_rowid='id', tokenize='trigram case_sensitive 0')",
+            f"INSERT INTO {search_table}({search_table}) VALUES ('rebuild')",
+            *search_triggers_sql(table),
+        ]
+    return sql
+
+
+def drop_search_tables_sql():
+    sql = []
+    for table in SEARCH_COLUMNS:
+        sql += [*drop_search_triggers_sql(table), f"DROP TABLE {table}_search"]
+    return sql
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0003_reservation_period_index'),
+    ]
+
+    operations = [
+        # CreateExtension queries pg_extension when unapplied, even on other databases.
+        VendorRunSQL(
+            'postgresql',
+            sql='CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            reverse_sql='DROP EXTENSION IF EXISTS pg_trgm',
+        ),
+        VendorRunSQL('postgresql', sql=trigram_indexes_sql(), reverse_sql=drop_trigram_indexes_sql()),
+        VendorRunSQL('sqlite', sql=search_tables_sql(), reverse_sql=drop_search_tables_sql()),
+    ]
@@ -0,0 +1,72 @@
+import unicodedata
+
+from django.db import migrations, models
+
+from manager.triggers import drop_search_triggers_sql, search_triggers_sql
+from shared.db import VendorRunSQL
+
+
+def location_key(value):
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.casefold().split())
+
+
+def populate_location_keys(apps, schema_editor):
+    Property = apps.get_model('manager', 'Property')
+    properties = list(Property.objects.only('address_neighborhood', 'address_city', 'address_state'))
+    for property_instance in properties:
+        property_instance.neighborhood_key = location_key(property_instance.address_neighborhood)
+        property_instance.city_key = location_key(property_instance.address_city)
+        property_instance.state_key = location_key(property_instance.address_state)
+    Property.objects.bulk_update(properties, ['neighborhood_key', 'city_key', 'state_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0004_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='neighborhood_key',
+            field=models.CharField(default='', editable=False, max_length=200),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='city_key',
+            field=models.CharField(default='', editable=False, max_length=200),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='state_key',
+            field=models.CharField(default='', editable=False, max_length=200),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_location_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city_key', 'capacity', 'price_per_night'], name='manager_property_city_idx', opclasses=['varchar_pattern_ops', 'int4_ops', 'numeric_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['country', 'state_key', 'city_key'], name='manager_property_state_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['neighborhood_key', 'city_key'], name='manager_property_hood_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+        # SQLite adds the columns by rebuilding the table, which drops the triggers of its search table.
+        VendorRunSQL(
+            'sqlite',
+            sql=[
+                *drop_search_triggers_sql('manager_property', if_exists=True),
+                *search_triggers_sql('manager_property'),
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0005_property_location_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hostcommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_host_comm_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ownercommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_owner_comm_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['title', 'id'], name='manager_property_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status', 'Confirmed')), fields=['property', 'start_date', 'end_date'], name='manager_reservation_conf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seazonecommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_seazone_comm_date_idx'),
+        ),
+    ]
@@ -0,0 +1,149 @@
+from functools import partial
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import migrations, models
+from django.db.models import BigIntegerField, F, FloatField
+from django.db.models.functions import Cast, Round
+
+import shared.money
+from manager.triggers import (
+    drop_reservation_overlap_triggers_sql,
+    drop_search_triggers_sql,
+    reservation_overlap_triggers_sql,
+    search_triggers_sql,
+)
+from shared.db import VendorRunSQL
+
+
+COMMISSION_MODELS = ('seazonecommission', 'hostcommission', 'ownercommission')
+
+# (model, field, replaced field, new field, factor from the old value to the stored integer)
+CONVERTED_FIELDS = [
+    (
+        'property', 'price_per_night', models.DecimalField(decimal_places=2, max_digits=10),
+        shared.money.MoneyField(decimal_places=2, max_digits=10), 100,
+    ),
+    *[
+        (
+            'property', name, models.FloatField(validators=[MinValueValidator(0), MaxValueValidator(1)]),
+            shared.money.BasisPointsField(validators=[MinValueValidator(0), MaxValueValidator(1)]), 10000,
+        )
+        for name in ('seazone_commission', 'host_commission', 'owner_commission')
+    ],
+    (
+        'reservation', 'total_price', models.DecimalField(decimal_places=2, editable=False, max_digits=10),
+        shared.money.MoneyField(decimal_places=2, editable=False, max_digits=10), 100,
+    ),
+    *[
+        (model_name, name, old_field, field, factor)
+        for model_name in COMMISSION_MODELS
+        for name, old_field, field, factor in (
+            ('commission_percent', models.FloatField(), shared.money.BasisPointsField(), 10000),
+            (
+                'commission_value', models.DecimalField(decimal_places=2, max_digits=10),
+                shared.money.MoneyField(decimal_places=2, max_digits=10), 100,
+            ),
+        )
+    ],
+    (
+        'commissionrollup', 'total_commission', models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        shared.money.MoneyField(decimal_places=2, default=0, max_digits=14), 100,
+    ),
+]
+
+
+def copy_scaled(apps, schema_editor, model_name, source, target, factor):
+    # The target field is written as is, the expression skips its conversion.
+    model = apps.get_model('manager', model_name)
+    model.objects.update(**{target: Cast(Round(F(source) * factor), BigIntegerField())})
+
+
+def copy_unscaled(apps, schema_editor, model_name, source, target, factor):
+    model = apps.get_model('manager', model_name)
+    model.objects.update(**{source: Cast(F(target), FloatField()) / factor})
+
+
+def convert_field_operations(model_name, name, old_field, field, factor):
+    """
+    Replaces a decimal or float column by its integer form: a new column is filled with the
+    scaled values in a single UPDATE, then takes the place of the old one.
+
+    Rolling back adds the old column again with a default of 0 and fills it from the integers.
+    """
+    new_name = f'{name}_units'
+    new_field = field.clone()
+    if not new_field.has_default():
+        new_field.default = 0
+    copy_arguments = {'model_name': model_name, 'source': name, 'target': new_name, 'factor': factor}
+    operations = [
+        migrations.AddField(
+            model_name=model_name, name=new_name, field=new_field, preserve_default=field.has_default()
+        ),
+        migrations.RunPython(partial(copy_scaled, **copy_arguments), partial(copy_unscaled, **copy_arguments)),
+    ]
+    if not old_field.has_default():
+        old_field = old_field.clone()
+        old_field.default = 0
+        operations.append(migrations.AlterField(model_name=model_name, name=name, field=old_field))
+    return operations + [
+        migrations.RemoveField(model_name=model_name, name=name),
+        migrations.RenameField(model_name=model_name, old_name=new_name, new_name=name),
+    ]
+
+
+# SQLite rebuilds the altered tables, which drops their triggers and the index created in SQL.
+def sqlite_triggers_sql():
+    sql = [
+        "CREATE INDEX IF NOT EXISTS manager_reservation_period ON manager_reservation "
+        "(property_id, start_date, end_date)",
+        *drop_reservation_overlap_triggers_sql(if_exists=True),
+        *reservation_overlap_triggers_sql(),
+    ]
+    for table in ('manager_property', 'manager_reservation'):
+        sql += [*drop_search_triggers_sql(table, if_exists=True), *search_triggers_sql(table)]
+    return sql
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        # Rolling back rebuilds the tables again, the triggers are created once it is done.
+        VendorRunSQL('sqlite', sql=migrations.RunSQL.noop, reverse_sql=sqlite_triggers_sql()),
+        # The indexes on the converted columns are created again once they are replaced.
+        migrations.RemoveIndex(model_name='property', name='manager_property_city_idx'),
+        migrations.RemoveIndex(model_name='seazonecommission', name='manager_seazone_comm_date_idx'),
+        migrations.RemoveIndex(model_name='hostcommission', name='manager_host_comm_date_idx'),
+        migrations.RemoveIndex(model_name='ownercommission', name='manager_owner_comm_date_idx'),
+        # Created again after the SQLite period index: on equal cost SQLite picks the newest index.
+        migrations.RemoveIndex(model_name='reservation', name='manager_reservation_conf_idx'),
+        *[
+            operation
+            for model_name, name, old_field, field, factor in CONVERTED_FIELDS
+            for operation in convert_field_operations(model_name, name, old_field, field, factor)
+        ],
+        VendorRunSQL('sqlite', sql=sqlite_triggers_sql(), reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status', 'Confirmed')), fields=['property', 'start_date', 'end_date'], name='manager_reservation_conf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city_key', 'capacity', 'price_per_night'], name='manager_property_city_idx', opclasses=['varchar_pattern_ops', 'int4_ops', 'int8_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='seazonecommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_seazone_comm_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostcommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_host_comm_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ownercommission',
+            index=models.Index(fields=['reservation_date', 'reservation', 'commission_value'], name='manager_owner_comm_date_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from shared.db import VendorRunSQL
+
+
+class Migration(migrations.Migration):
+    """
+    Only confirmed reservations occupy dates, so the overlap queries are served by partial
+    indexes on status = 'Confirmed' and the full period indexes are dropped: on PostgreSQL the
+    GiST index of the overlap exclusion constraint, elsewhere manager_reservation_conf_idx.
+    """
+
+    dependencies = [
+        ('manager', '0007_money_minor_units'),
+    ]
+
+    operations = [
+        VendorRunSQL(
+            'postgresql',
+            sql="DROP INDEX manager_reservation_period_gist",
+            reverse_sql=(
+                "CREATE INDEX manager_reservation_period_gist ON manager_reservation "
+                "USING gist (property_id, daterange(start_date, end_date, '[)'))"
+            ),
+        ),
+        VendorRunSQL(
+            'sqlite',
+            sql="DROP INDEX IF EXISTS manager_reservation_period",
+            reverse_sql=(
+                "CREATE INDEX manager_reservation_period ON manager_reservation "
+                "(property_id, start_date, end_date)"
+            ),
+        ),
+    ]
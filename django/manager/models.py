@@ -1,11 +1,27 @@
+# Base imports
+import unicodedata
+
 # Django imports
-from django.db import models
+from django.db import connections, models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 
 # Project imports
-from manager.signals import generate_commissions
+from manager.signals import generate_commissions, invalidate_occupancy, remove_reservation_commissions
+from shared.cache import bump_response_cache_version
+from shared.db import DateRange
 from shared.models import BaseModelDate
+from shared.money import BasisPointsField, MoneyField
+
+
+RESERVATION_OVERLAP_CONSTRAINT = 'manager_reservation_no_overlap'
+
+
+def location_key(value):
+    """ Case and accent folded form of a location name, with its whitespace collapsed. """
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.casefold().split())
 
 
 class Owner(BaseModelDate):
@@ -40,23 +56,86 @@ class Property(BaseModelDate):
     country = models.CharField(max_length=3)
     rooms = models.PositiveIntegerField()
     capacity = models.PositiveIntegerField()
-    price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+    price_per_night = MoneyField(max_digits=10, decimal_places=2)
     owner = models.ForeignKey(Owner, on_delete=models.CASCADE, related_name='properties')
     host = models.ForeignKey(Host, on_delete=models.CASCADE, related_name='properties')
-    seazone_commission = models.FloatField(validators=[MinValueValidator(0), MaxValueValidator(1)])
-    host_commission = models.FloatField(validators=[MinValueValidator(0), MaxValueValidator(1)])
-    owner_commission = models.FloatField(validators=[MinValueValidator(0), MaxValueValidator(1)])
+    seazone_commission = BasisPointsField(validators=[MinValueValidator(0), MaxValueValidator(1)])
+    host_commission = BasisPointsField(validators=[MinValueValidator(0), MaxValueValidator(1)])
+    owner_commission = BasisPointsField(validators=[MinValueValidator(0), MaxValueValidator(1)])
+    # Normalized location keys, the exact and prefix location filters use their indexes.
+    neighborhood_key = models.CharField(max_length=200, editable=False)
+    city_key = models.CharField(max_length=200, editable=False)
+    state_key = models.CharField(max_length=200, editable=False)
 
     def __str__(self):
         return self.title
 
+    def set_location_keys(self):
+        self.neighborhood_key = location_key(self.address_neighborhood)
+        self.city_key = location_key(self.address_city)
+        self.state_key = location_key(self.address_state)
+
+    def save(self, *args, **kwargs):
+        self.set_location_keys()
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ('title',)
+        # The pattern operator classes let PostgreSQL serve the prefix (LIKE 'x%') filters too.
+        indexes = [
+            # Serves the title ordering and its keyset pages.
+            models.Index(fields=['title', 'id'], name='manager_property_title_idx'),
+            models.Index(
+                fields=['city_key', 'capacity', 'price_per_night'],
+                opclasses=['varchar_pattern_ops', 'int4_ops', 'int8_ops'],
+                name='manager_property_city_idx',
+            ),
+            models.Index(
+                fields=['country', 'state_key', 'city_key'],
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops', 'varchar_pattern_ops'],
+                name='manager_property_state_idx',
+            ),
+            models.Index(
+                fields=['neighborhood_key', 'city_key'],
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+                name='manager_property_hood_idx',
+            ),
+        ]
+
 
 class StatusChoices(models.TextChoices):
     CONFIRMED = 'Confirmed', _('Confirmed')
     CANCELLED = 'Cancelled', _('Cancelled')
 
+
+class ReservationQuerySet(models.QuerySet):
+
+    def confirmed(self):
+        return self.filter(status=StatusChoices.CONFIRMED)
+
+    def overlapping(self, start_date, end_date):
+        """
+        Confirmed reservations whose [start_date, end_date) interval overlaps the given one,
+        cancelled reservations do not occupy their dates.
+
+        On PostgreSQL the filter is written against the DATERANGE expression covered by the
+        partial GiST index of the overlap constraint, elsewhere it falls back to the date
+        comparisons of the partial confirmed index.
+        """
+        reservations = self.confirmed()
+        if connections[self.db].vendor == 'postgresql':
+            from django.db.backends.postgresql.psycopg_any import DateRange as DateRangeValue
+
+            return reservations.alias(
+                period=DateRange('start_date', 'end_date', models.Value('[)'))
+            ).filter(period__overlap=DateRangeValue(start_date, end_date, '[)'))
+        return reservations.filter(start_date__lt=end_date, end_date__gt=start_date)
+
+
+# Fields the total price of a reservation is calculated from.
+PRICE_FIELDS = {'property', 'property_id', 'start_date', 'end_date'}
+
+
 class Reservation(BaseModelDate):
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="reservations")
     start_date = models.DateField()
@@ -64,43 +143,78 @@ class Reservation(BaseModelDate):
     client_name = models.CharField(max_length=100)
     client_email = models.EmailField()
     guests_quantity = models.IntegerField()
-    total_price = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
+    total_price = MoneyField(max_digits=10, decimal_places=2, editable=False)
     status = models.CharField(
         max_length=10,
         choices=StatusChoices.choices,
         default=StatusChoices.CONFIRMED
     )
 
+    objects = ReservationQuerySet.as_manager()
+
     def __str__(self):
         return f'{self.property} - {self.client_name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = dict(zip(field_names, values)).get('status')
+        return instance
+
+    @staticmethod
+    def calculate_total_price(price_per_night, start_date, end_date):
+        nights = (end_date - start_date).days
+        return price_per_night * nights
+
     def save(self, *args, **kwargs):
-        nights = (self.end_date - self.start_date).days
-        self.total_price = self.property.price_per_night * nights
-        super().save(*args, **kwargs)
+        # Saves of other fields, like a cancellation, keep the price the reservation was made at.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or PRICE_FIELDS.intersection(update_fields):
+            self.total_price = self.calculate_total_price(self.property.price_per_night, self.start_date, self.end_date)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'total_price'}
+        # The commissions are generated by the post_save signal, inside the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            # The confirmed bookings of a property by period, checked against every new booking.
+            models.Index(
+                fields=['property', 'start_date', 'end_date'],
+                condition=models.Q(status=StatusChoices.CONFIRMED),
+                name='manager_reservation_conf_idx',
+            ),
+        ]
 
 
 class SeazoneCommission(BaseModelDate):
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, related_name="seazone_commission")
     reservation_date = models.DateField()
-    commission_percent = models.FloatField()
-    commission_value = models.DecimalField(max_digits=10, decimal_places=2)
+    commission_percent = BasisPointsField()
+    commission_value = MoneyField(max_digits=10, decimal_places=2)
 
     def __str__(self):
         return f'{self.reservation.__str__()} - {self.commission_value}'
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            # Commissions by date range and property, the commission value is read from the index.
+            models.Index(
+                fields=['reservation_date', 'reservation', 'commission_value'],
+                name='manager_seazone_comm_date_idx',
+            ),
+        ]
 
 
 class HostCommission(BaseModelDate):
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, related_name="host_commission")
     reservation_date = models.DateField()
-    commission_percent = models.FloatField()
-    commission_value = models.DecimalField(max_digits=10, decimal_places=2)
+    commission_percent = BasisPointsField()
+    commission_value = MoneyField(max_digits=10, decimal_places=2)
     host = models.ForeignKey(Host, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -108,13 +222,19 @@ class HostCommission(BaseModelDate):
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['reservation_date', 'reservation', 'commission_value'],
+                name='manager_host_comm_date_idx',
+            ),
+        ]
 
 
 class OwnerCommission(BaseModelDate):
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, related_name="owner_commission")
     reservation_date = models.DateField()
-    commission_percent = models.FloatField()
-    commission_value = models.DecimalField(max_digits=10, decimal_places=2)
+    commission_percent = BasisPointsField()
+    commission_value = MoneyField(max_digits=10, decimal_places=2)
     owner = models.ForeignKey(Owner, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -122,6 +242,46 @@ class OwnerCommission(BaseModelDate):
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['reservation_date', 'reservation', 'commission_value'],
+                name='manager_owner_comm_date_idx',
+            ),
+        ]
+
+
+class CommissionTypeChoices(models.TextChoices):
+    SEAZONE = 'seazone', _('Seazone')
+    HOST = 'host', _('Host')
+    OWNER = 'owner', _('Owner')
+
+
+class CommissionRollup(BaseModelDate):
+    commission_type = models.CharField(max_length=10, choices=CommissionTypeChoices.choices)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="commission_rollups")
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    total_commission = MoneyField(max_digits=14, decimal_places=2, default=0)
+    total_reservations = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.property.__str__()} - {self.commission_type} - {self.month:02d}/{self.year}'
+
+    class Meta:
+        ordering = ('id',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=('commission_type', 'year', 'month', 'property'),
+                name='unique_commission_rollup_period'
+            ),
+        ]
 
 
-models.signals.post_save.connect(generate_commissions, sender=Reservation)
\ No newline at end of file
+models.signals.post_save.connect(generate_commissions, sender=Reservation)
+# Before the commissions are deleted in cascade.
+models.signals.pre_delete.connect(remove_reservation_commissions, sender=Reservation)
+models.signals.post_save.connect(invalidate_occupancy, sender=Reservation)
+models.signals.post_delete.connect(invalidate_occupancy, sender=Reservation)
+for cached_model in (Owner, Host, Property):
+    models.signals.post_save.connect(bump_response_cache_version, sender=cached_model)
+    models.signals.post_delete.connect(bump_response_cache_version, sender=cached_model)
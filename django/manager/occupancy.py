@@ -0,0 +1,108 @@
+# Base imports
+from datetime import date
+
+# Django imports
+from django.db import router, transaction
+
+# Project imports
+from manager.models import Reservation
+from shared.cache import get_response_cache
+
+
+OCCUPANCY_EPOCH = date(2000, 1, 1)
+OCCUPANCY_CACHE_KEY = 'property_occupancy:{property_id}'
+# Bounds how long a bitmap missed by an invalidation can be served.
+OCCUPANCY_CACHE_TIMEOUT = 60 * 60
+
+
+class OccupancyBitmap:
+    """
+    Booked nights of a property, one bit per night counted from OCCUPANCY_EPOCH.
+
+    Bitmaps of different reservations or properties share the same origin, so they merge
+    with a bitwise OR and window reads are shifts and masks.
+    """
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @staticmethod
+    def _offset(day):
+        return (day - OCCUPANCY_EPOCH).days
+
+    @classmethod
+    def _mask(cls, start_date, end_date):
+        # Nights before the epoch have no bit, a period is cut at it.
+        offset = max(cls._offset(start_date), 0)
+        nights = cls._offset(end_date) - offset
+        if nights <= 0:
+            return 0
+        return ((1 << nights) - 1) << offset
+
+    @classmethod
+    def from_periods(cls, periods):
+        bits = 0
+        for start_date, end_date in periods:
+            bits |= cls._mask(start_date, end_date)
+        return cls(bits)
+
+    def __or__(self, other):
+        return OccupancyBitmap(self.bits | other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, OccupancyBitmap) and self.bits == other.bits
+
+    def window(self, start_date, end_date):
+        """
+        Bits of the nights in [start_date, end_date), the first night in the lowest bit. Windows
+        starting before OCCUPANCY_EPOCH are rejected, their nights are not recorded.
+        """
+        offset = self._offset(start_date)
+        if offset < 0:
+            raise ValueError(f'The window cannot start before {OCCUPANCY_EPOCH.isoformat()}.')
+        nights = (end_date - start_date).days
+        return (self.bits >> offset) & ((1 << nights) - 1)
+
+    def occupied_nights(self, start_date, end_date):
+        return self.window(start_date, end_date).bit_count()
+
+    def free_nights(self, start_date, end_date):
+        return (end_date - start_date).days - self.occupied_nights(start_date, end_date)
+
+    def is_free(self, start_date, end_date):
+        return not self.window(start_date, end_date)
+
+    def days(self, start_date, end_date):
+        """ One character per night of the window, '1' when booked and '0' when free. """
+        nights = (end_date - start_date).days
+        return format(self.window(start_date, end_date), f'0{nights}b')[::-1]
+
+
+def get_property_occupancy(property_id):
+    """
+    Occupancy bitmap of the confirmed reservations of a property, kept in the shared response
+    cache until one of its reservations changes or OCCUPANCY_CACHE_TIMEOUT passes.
+    """
+    cache = get_response_cache()
+    cache_key = OCCUPANCY_CACHE_KEY.format(property_id=property_id)
+    bits = cache.get(cache_key)
+    if bits is None:
+        bits = OccupancyBitmap.from_periods(
+            Reservation.objects.confirmed().filter(property_id=property_id).values_list('start_date', 'end_date')
+        ).bits
+        cache.set(cache_key, bits, timeout=OCCUPANCY_CACHE_TIMEOUT)
+    return OccupancyBitmap(bits)
+
+
+def invalidate_property_occupancy(*property_ids):
+    """
+    Drops the cached bitmaps of the properties. Inside a transaction they are dropped again on
+    commit, so a bitmap built from the data read before the commit is not served afterwards.
+    """
+    cache = get_response_cache()
+    cache_keys = [OCCUPANCY_CACHE_KEY.format(property_id=property_id) for property_id in property_ids]
+    cache.delete_many(cache_keys)
+    using = router.db_for_write(Reservation)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(cache_keys), using=using)
@@ -0,0 +1,137 @@
+# Base imports
+from datetime import timedelta
+
+# Django imports
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+# Project imports
+from manager.models import Property, Reservation, SeazoneCommission, StatusChoices
+from manager.rollups import commission_rollup_rows, month_bounds
+
+
+PLAN_PAGE_SIZE = 50
+
+
+def get_plan_sample(using=DEFAULT_DB_ALIAS):
+    """
+    Parameters of the hot queries, taken from the first confirmed reservation so the plans are
+    the ones of values found in the data.
+    """
+    reservation = Reservation.objects.using(using).filter(
+        status=StatusChoices.CONFIRMED
+    ).select_related('property').order_by('id').first()
+    if reservation is None:
+        start_date = timezone.now().date()
+        return {
+            'property_id': 0,
+            'city_key': '',
+            'capacity': 1,
+            'start_date': start_date,
+            'end_date': start_date + timedelta(days=7),
+        }
+    return {
+        'property_id': reservation.property_id,
+        'city_key': reservation.property.city_key,
+        'capacity': reservation.guests_quantity,
+        'start_date': reservation.start_date,
+        'end_date': reservation.end_date,
+    }
+
+
+def hot_queries(sample, using=DEFAULT_DB_ALIAS):
+    """
+    (name, description, queryset, index names by vendor) of the queries of the hot paths, any of
+    the index names in the plan means the query is served by its index.
+    """
+    reservations = Reservation.objects.using(using)
+    start_date, end_date = sample['start_date'], sample['end_date']
+    month_start_date, month_end_date = month_bounds(end_date.year, end_date.month)
+    return [
+        (
+            'reservation_overlap',
+            'Availability of a property: its confirmed reservations overlapping a period.',
+            reservations.filter(property_id=sample['property_id']).overlapping(start_date, end_date),
+            {
+                # The partial GiST index of the overlap exclusion constraint.
+                'postgresql': ('manager_reservation_no_overlap',),
+                'sqlite': ('manager_reservation_conf_idx',),
+            },
+        ),
+        (
+            'confirmed_reservation_overlap',
+            'Booking check: the confirmed reservations of a property overlapping a period, as date comparisons.',
+            reservations.filter(
+                property_id=sample['property_id'],
+                status=StatusChoices.CONFIRMED,
+                start_date__lt=end_date,
+                end_date__gt=start_date,
+            ),
+            {
+                'postgresql': ('manager_reservation_conf_idx',),
+                'sqlite': ('manager_reservation_conf_idx',),
+            },
+        ),
+        (
+            'commissions_by_month',
+            'Commission rollup rebuild of a month: commissions by date range, grouped by property.',
+            commission_rollup_rows(SeazoneCommission, month_start_date, month_end_date).using(using),
+            {
+                'postgresql': ('manager_seazone_comm_date_idx',),
+                'sqlite': ('manager_seazone_comm_date_idx',),
+            },
+        ),
+        (
+            'property_title_page',
+            'Property list: first page in the title ordering.',
+            Property.objects.using(using).order_by('title', 'id')[:PLAN_PAGE_SIZE],
+            {
+                'postgresql': ('manager_property_title_idx',),
+                'sqlite': ('manager_property_title_idx',),
+            },
+        ),
+        (
+            'property_city',
+            'Property list filtered by city and capacity.',
+            Property.objects.using(using).filter(
+                city_key=sample['city_key'], capacity__gte=sample['capacity']
+            ).order_by('title', 'id')[:PLAN_PAGE_SIZE],
+            {
+                'postgresql': ('manager_property_city_idx',),
+                'sqlite': ('manager_property_city_idx',),
+            },
+        ),
+    ]
+
+
+def explain_hot_queries(using=DEFAULT_DB_ALIAS, analyze=False):
+    """
+    EXPLAIN of every hot query, with the index expected to serve it and whether the plan uses it.
+    ``analyze`` runs the queries (EXPLAIN ANALYZE, BUFFERS) on PostgreSQL.
+    """
+    vendor = connections[using].vendor
+    options = {'analyze': True, 'buffers': True} if analyze and vendor == 'postgresql' else {}
+    sample = get_plan_sample(using)
+
+    queries = []
+    for name, description, queryset, indexes in hot_queries(sample, using=using):
+        expected_indexes = indexes.get(vendor, ())
+        plan = queryset.explain(**options)
+        queries.append({
+            'name': name,
+            'description': description,
+            'sql': str(queryset.query),
+            'plan': plan,
+            'expected_indexes': expected_indexes,
+            'index_used': next((index for index in expected_indexes if index in plan), None),
+        })
+
+    return {
+        'vendor': vendor,
+        'rows': {
+            model._meta.db_table: model.objects.using(using).count()
+            for model in (Property, Reservation, SeazoneCommission)
+        },
+        'sample': sample,
+        'queries': queries,
+    }
@@ -0,0 +1,64 @@
+# Django imports
+from django.utils.translation import gettext_lazy as _
+
+# Project imports
+from manager.commissions import split_commission_units
+from manager.models import Property
+from shared.money import from_minor_units, to_basis_points, to_minor_units
+
+
+QUOTE_MAX_STAYS = 10000
+
+
+def property_quote_rates(property_ids):
+    """
+    (capacity, price per night in cents, seazone and host basis points) of the properties, by id,
+    read in a single query.
+    """
+    return {
+        property_id: (capacity, to_minor_units(price_per_night), to_basis_points(seazone), to_basis_points(host))
+        for property_id, capacity, price_per_night, seazone, host in Property.objects.filter(
+            id__in=property_ids
+        ).order_by().values_list('id', 'capacity', 'price_per_night', 'seazone_commission', 'host_commission')
+    }
+
+
+def quote_stays(stays):
+    """
+    Total price and commission split of stays (property, start_date, end_date, guests_quantity),
+    in the order given, the same values a reservation would be saved with.
+
+    The properties are read once, then every stay is priced in integer cents; the stays of a
+    missing property or above its capacity get errors instead.
+    """
+    rates = property_quote_rates({stay['property'] for stay in stays})
+    not_found = [_("Property not found.")]
+    over_capacity = [_("The number of guests exceeds the maximum capacity of the property.")]
+
+    quotes = []
+    for stay in stays:
+        quote = {
+            'property': stay['property'],
+            'start_date': stay['start_date'],
+            'end_date': stay['end_date'],
+            'guests_quantity': stay['guests_quantity'],
+        }
+        property_rates = rates.get(stay['property'])
+        if property_rates is None:
+            quote['errors'] = not_found
+        elif stay['guests_quantity'] > property_rates[0]:
+            quote['errors'] = over_capacity
+        else:
+            _capacity, price_units, seazone_basis_points, host_basis_points = property_rates
+            nights = (stay['end_date'] - stay['start_date']).days
+            total_units = price_units * nights
+            seazone_units, host_units, owner_units = split_commission_units(
+                total_units, seazone_basis_points, host_basis_points
+            )
+            quote['nights'] = nights
+            quote['total_price'] = str(from_minor_units(total_units))
+            quote['seazone_commission'] = str(from_minor_units(seazone_units))
+            quote['host_commission'] = str(from_minor_units(host_units))
+            quote['owner_commission'] = str(from_minor_units(owner_units))
+        quotes.append(quote)
+    return quotes
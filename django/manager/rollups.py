@@ -0,0 +1,84 @@
+# Base imports
+from collections import defaultdict
+from decimal import Decimal
+from importlib import import_module
+
+# Django imports
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Value
+
+# Project imports
+from manager.models import (
+    CommissionRollup,
+    CommissionTypeChoices,
+    HostCommission,
+    OwnerCommission,
+    SeazoneCommission,
+)
+
+# The migration that backfilled the rollups holds the single definition of their rebuild.
+rollups_migration = import_module('manager.migrations.0002_commissionrollup')
+month_bounds = rollups_migration.month_bounds
+commission_rollup_rows = rollups_migration.commission_rollup_rows
+
+
+COMMISSION_MODELS = {
+    CommissionTypeChoices.SEAZONE: SeazoneCommission,
+    CommissionTypeChoices.HOST: HostCommission,
+    CommissionTypeChoices.OWNER: OwnerCommission,
+}
+
+
+def commission_rollup_deltas(typed_commissions, direction=1):
+    """
+    Groups (commission type, commission) pairs in the rollup changes they cause, keyed by
+    (commission type, property id, year, month). Direction -1 removes the commissions.
+    """
+    deltas = defaultdict(lambda: [Decimal('0'), 0])
+    for commission_type, commission in typed_commissions:
+        reservation_date = commission.reservation_date
+        delta = deltas[(
+            commission_type, commission.reservation.property_id, reservation_date.year, reservation_date.month
+        )]
+        delta[0] += commission.commission_value * direction
+        delta[1] += direction
+    return deltas
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Applies rollup changes: the missing rollups are inserted in one statement, then each
+    rollup is incremented in place.
+    """
+    if not deltas:
+        return
+
+    total_commission_field = CommissionRollup._meta.get_field('total_commission')
+    with transaction.atomic(savepoint=False):
+        CommissionRollup.objects.bulk_create(
+            [
+                CommissionRollup(commission_type=commission_type, property_id=property_id, year=year, month=month)
+                for commission_type, property_id, year, month in deltas
+            ],
+            ignore_conflicts=True
+        )
+        for (commission_type, property_id, year, month), (total_commission, total_reservations) in deltas.items():
+            CommissionRollup.objects.filter(
+                commission_type=commission_type,
+                property_id=property_id,
+                year=year,
+                month=month,
+            ).update(
+                # Converted to cents by the field, like the column.
+                total_commission=F('total_commission') + Value(total_commission, output_field=total_commission_field),
+                total_reservations=F('total_reservations') + total_reservations,
+            )
+
+
+def rebuild_commission_rollups(year=None, month=None):
+    """
+    Rebuilds the monthly rollups from the commissions of the confirmed reservations, every
+    rollup or only the ones of a month.
+    """
+    return rollups_migration.rebuild_commission_rollups(apps, year=year, month=month)
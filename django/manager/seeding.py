@@ -0,0 +1,183 @@
+# Base imports
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Django imports
+from django.db import transaction
+
+# Project imports
+from manager.commissions import create_commissions
+from manager.models import Host, Owner, Property, Reservation, StatusChoices
+from manager.occupancy import invalidate_property_occupancy
+from manager.rollups import rebuild_commission_rollups
+from shared.cache import bump_model_version
+
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Camila', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+    'Larissa', 'Lucas', 'Mariana', 'Nicolas', 'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitória', 'Zé',
+)
+LAST_NAMES = (
+    'Almeida', 'Barbosa', 'Cardoso', 'Costa', 'Ferreira', 'Gomes', 'Lima', 'Martins', 'Oliveira', 'Pereira',
+    'Ribeiro', 'Rocha', 'Santos', 'Silva', 'Souza',
+)
+# (city, state, neighborhoods)
+LOCATIONS = (
+    ('Florianópolis', 'Santa Catarina', ('Jurerê', 'Canasvieiras', 'Lagoa da Conceição', 'Centro', 'Ingleses')),
+    ('São Paulo', 'São Paulo', ('Pinheiros', 'Vila Madalena', 'Moema', 'Jardins', 'Bela Vista')),
+    ('Rio de Janeiro', 'Rio de Janeiro', ('Copacabana', 'Ipanema', 'Leblon', 'Botafogo', 'Barra da Tijuca')),
+    ('Salvador', 'Bahia', ('Barra', 'Rio Vermelho', 'Pelourinho', 'Itapuã')),
+    ('Gramado', 'Rio Grande do Sul', ('Centro', 'Planalto', 'Bavária')),
+    ('Porto de Galinhas', 'Pernambuco', ('Centro', 'Muro Alto', 'Cupe')),
+    ('Búzios', 'Rio de Janeiro', ('Geribá', 'Ferradura', 'Centro')),
+    ('Bombinhas', 'Santa Catarina', ('Bombas', 'Mariscal', 'Zimbros')),
+)
+STREETS = ('Rua das Flores', 'Avenida Atlântica', 'Rua do Sol', 'Avenida Beira Mar', 'Rua XV de Novembro')
+PROPERTY_KINDS = ('Apartamento', 'Casa', 'Studio', 'Cobertura', 'Chalé', 'Loft')
+
+
+class DataSeeder:
+    """
+    Generates owners, hosts, properties and reservations with their commissions, written with
+    bulk INSERTs in batches. The same seed and volumes always generate the same rows.
+
+    Each property gets consecutive, non overlapping stays from start_date on, about one in ten
+    cancelled. The commission rollups are rebuilt once at the end.
+    """
+
+    def __init__(
+        self, owners=100, hosts=50, properties=1000, reservations=20000, seed=0,
+        start_date=date(2023, 1, 1), batch_size=2000, stdout=None
+    ):
+        self.owners = owners
+        self.hosts = hosts
+        self.properties = properties
+        self.reservations = reservations
+        self.start_date = start_date
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.random = random.Random(seed)
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def person(self):
+        first_name = self.random.choice(FIRST_NAMES)
+        last_name = self.random.choice(LAST_NAMES)
+        username = f'{first_name}.{last_name}{self.random.randint(1, 9999)}'.lower()
+        return {
+            'name': f'{first_name} {last_name}',
+            'email': f'{username}@example.com',
+            'phone': f'+55 {self.random.randint(11, 99)} 9{self.random.randint(1000, 9999)}-{self.random.randint(1000, 9999)}',
+        }
+
+    def bulk_create(self, model, instances):
+        created = []
+        for start in range(0, len(instances), self.batch_size):
+            created += model.objects.bulk_create(instances[start:start + self.batch_size])
+        return created
+
+    def create_owners(self):
+        return self.bulk_create(Owner, [Owner(**self.person()) for _ in range(self.owners)])
+
+    def create_hosts(self):
+        return self.bulk_create(Host, [Host(**self.person()) for _ in range(self.hosts)])
+
+    def build_property(self, owner, host):
+        city, state, neighborhoods = self.random.choice(LOCATIONS)
+        neighborhood = self.random.choice(neighborhoods)
+        rooms = self.random.randint(1, 5)
+        seazone_commission = self.random.choice((0.1, 0.15, 0.2))
+        host_commission = self.random.choice((0.05, 0.1, 0.15))
+        property_instance = Property(
+            title=f'{self.random.choice(PROPERTY_KINDS)} {rooms} quartos em {neighborhood}',
+            address_street=self.random.choice(STREETS),
+            address_number=str(self.random.randint(1, 3000)),
+            address_neighborhood=neighborhood,
+            address_city=city,
+            address_state=state,
+            country='BRA',
+            rooms=rooms,
+            capacity=rooms * 2 + self.random.randint(0, 2),
+            price_per_night=Decimal(self.random.randint(8000, 150000)) / 100,
+            owner=owner,
+            host=host,
+            seazone_commission=seazone_commission,
+            host_commission=host_commission,
+            owner_commission=round(1 - seazone_commission - host_commission, 2),
+        )
+        # bulk_create does not call save().
+        property_instance.set_location_keys()
+        return property_instance
+
+    def create_properties(self, owners, hosts):
+        return self.bulk_create(Property, [
+            self.build_property(self.random.choice(owners), self.random.choice(hosts))
+            for _ in range(self.properties)
+        ])
+
+    def build_reservations(self, properties):
+        """ Yields the reservations, property by property, spread as evenly as the total allows. """
+        per_property, extra = divmod(self.reservations, len(properties)) if properties else (0, 0)
+        for index, property_instance in enumerate(properties):
+            start_date = self.start_date + timedelta(days=self.random.randint(0, 30))
+            for _ in range(per_property + (index < extra)):
+                nights = self.random.randint(1, 14)
+                end_date = start_date + timedelta(days=nights)
+                client = self.person()
+                reservation = Reservation(
+                    property=property_instance,
+                    start_date=start_date,
+                    end_date=end_date,
+                    client_name=client['name'],
+                    client_email=client['email'],
+                    guests_quantity=self.random.randint(1, property_instance.capacity),
+                    total_price=Reservation.calculate_total_price(
+                        property_instance.price_per_night, start_date, end_date
+                    ),
+                    status=StatusChoices.CANCELLED if self.random.random() < 0.1 else StatusChoices.CONFIRMED,
+                )
+                yield reservation
+                start_date = end_date + timedelta(days=self.random.randint(0, 10))
+
+    def create_reservations(self, properties):
+        total = 0
+        batch = []
+        for reservation in self.build_reservations(properties):
+            batch.append(reservation)
+            if len(batch) == self.batch_size:
+                total += self.write_reservations(batch)
+                batch = []
+        if batch:
+            total += self.write_reservations(batch)
+        return total
+
+    def write_reservations(self, reservations):
+        with transaction.atomic():
+            create_commissions(Reservation.objects.bulk_create(reservations), update_rollups=False)
+        self.log(f'{len(reservations)} reservations written.')
+        return len(reservations)
+
+    def run(self):
+        owners = self.create_owners()
+        hosts = self.create_hosts()
+        properties = self.create_properties(owners, hosts)
+        self.log(f'{len(owners)} owners, {len(hosts)} hosts and {len(properties)} properties written.')
+        reservations = self.create_reservations(properties)
+        rollups = rebuild_commission_rollups()
+
+        # bulk_create sends no signals, the caches are invalidated here.
+        for model in (Owner, Host, Property):
+            bump_model_version(model)
+        invalidate_property_occupancy(*[instance.id for instance in properties])
+
+        return {
+            'owners': len(owners),
+            'hosts': len(hosts),
+            'properties': len(properties),
+            'reservations': reservations,
+            'commissions': reservations * 3,
+            'commission_rollups': rollups,
+        }
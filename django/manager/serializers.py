@@ -1,4 +1,5 @@
 # Django imports
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -7,14 +8,19 @@ from rest_framework import serializers
 
 # Project imports
 from manager.models import (
+    RESERVATION_OVERLAP_CONSTRAINT,
     Property,
     Owner,
     Host,
     Reservation,
-    SeazoneCommission,
-    HostCommission,
-    OwnerCommission
+    StatusChoices,
 )
+from manager.quotes import QUOTE_MAX_STAYS
+from shared.money import BASIS_POINTS, to_basis_points
+
+
+# Internal normalized columns, not part of the API.
+PROPERTY_LOCATION_KEYS = ('neighborhood_key', 'city_key', 'state_key')
 
 
 class OwnerSerializer(serializers.ModelSerializer):
@@ -39,7 +45,7 @@ class PropertySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        fields = '__all__'
+        exclude = PROPERTY_LOCATION_KEYS
 
 
 
@@ -47,22 +53,23 @@ class PropertyOnlySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        exclude = ('owner', 'host')
+        exclude = ('owner', 'host', *PROPERTY_LOCATION_KEYS)
 
 
 class PropertyCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        fields = '__all__'
+        exclude = PROPERTY_LOCATION_KEYS
 
     def validate(self, data):
         seazone_commission = data.get('seazone_commission', 0)
         host_commission = data.get('host_commission', 0)
         owner_commission = data.get('owner_commission', 0)
 
-        total_commission = seazone_commission + host_commission + owner_commission
-        if total_commission != 1:
+        # Summed in basis points, 0.1 + 0.2 + 0.7 is not 1 in floats.
+        total_commission = sum(map(to_basis_points, (seazone_commission, host_commission, owner_commission)))
+        if total_commission != BASIS_POINTS:
             raise serializers.ValidationError(
                 _("The sum of seazone_commission, host_commission, and owner_commission must equal 1.")
             )
@@ -107,15 +114,40 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
             )
 
         overlapping_reservations = Reservation.objects.filter(
-            property=property,
-            start_date__lt=end_date,
-            end_date__gt=start_date
-        ).exists()
+            property=property
+        ).overlapping(start_date, end_date).exists()
         if overlapping_reservations:
-            raise serializers.ValidationError("The property is not available for the selected dates.")
+            raise serializers.ValidationError(_("The property is not available for the selected dates."))
 
         return data
 
+    def create(self, validated_data):
+        # The overlap check above is not race free, the database constraint is the final word.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as exception:
+            if RESERVATION_OVERLAP_CONSTRAINT not in str(exception):
+                raise
+            raise serializers.ValidationError(
+                {'errors': [_("The property is not available for the selected dates.")]}
+            )
+
+
+class ReservationImportSerializer(serializers.Serializer):
+    property = serializers.IntegerField()
+    client_name = serializers.CharField(max_length=100)
+    client_email = serializers.EmailField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    guests_quantity = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=StatusChoices.choices, default=StatusChoices.CONFIRMED)
+
+    def validate(self, data):
+        if data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError(_("The end date must be after the start date."))
+        return data
+
 
 class ReservationSerializer(serializers.ModelSerializer):
 
@@ -126,6 +158,14 @@ class ReservationSerializer(serializers.ModelSerializer):
     host_commission = serializers.SerializerMethodField()
     owner_commission = serializers.SerializerMethodField()
 
+    values_sources = {
+        'owner': ('property__owner', OwnerSerializer),
+        'host': ('property__host', HostSerializer),
+        'seazone_commission': 'seazone_commission__commission_value',
+        'host_commission': 'host_commission__commission_value',
+        'owner_commission': 'owner_commission__commission_value',
+    }
+
     class Meta:
         model = Reservation
         fields = '__all__'
@@ -140,15 +180,40 @@ class ReservationSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def get_seazone_commission(obj):
-        return SeazoneCommission.objects.get(reservation=obj).commission_value
+        return obj.seazone_commission.commission_value
 
     @staticmethod
     def get_host_commission(obj):
-        return HostCommission.objects.get(reservation=obj).commission_value
+        return obj.host_commission.commission_value
 
     @staticmethod
     def get_owner_commission(obj):
-        return OwnerCommission.objects.get(reservation=obj).commission_value
+        return obj.owner_commission.commission_value
+
+
+class AvailabilityDateRangeSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, data):
+        if data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError(_("The end date must be after the start date."))
+        return data
+
+
+class PropertyAvailabilitySearchSerializer(serializers.Serializer):
+    property_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    date_ranges = AvailabilityDateRangeSerializer(many=True, allow_empty=False, max_length=100)
+    guests_quantity = serializers.IntegerField(min_value=1)
+
+
+class StayQuoteSerializer(AvailabilityDateRangeSerializer):
+    property = serializers.IntegerField()
+    guests_quantity = serializers.IntegerField(min_value=1)
+
+
+class PropertyQuoteSerializer(serializers.Serializer):
+    stays = StayQuoteSerializer(many=True, allow_empty=False, max_length=QUOTE_MAX_STAYS)
 
 
 class CommissionSummarySerializer(serializers.Serializer):
@@ -0,0 +1,60 @@
+# Django imports
+from django.db.models import IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+# Project imports
+from manager.models import Property
+from shared.money import MoneyField
+
+
+def commission_statement_rows(commission_type, year=None, month=None):
+    """
+    (property id, total commission, total reservations) of every property, from the monthly
+    commission rollups in a single grouped query. Properties without commissions have zeroed totals.
+    """
+    rollup_filter = Q(commission_rollups__commission_type=commission_type)
+    if year and month:
+        rollup_filter &= Q(commission_rollups__year=year, commission_rollups__month=month)
+
+    return Property.objects.order_by('title', 'id').values('id').annotate(
+        total_commission=Coalesce(
+            Sum('commission_rollups__total_commission', filter=rollup_filter),
+            Value(0),
+            output_field=MoneyField(max_digits=14, decimal_places=2)
+        ),
+        total_reservations=Coalesce(
+            Sum('commission_rollups__total_reservations', filter=rollup_filter),
+            Value(0),
+            output_field=IntegerField()
+        ),
+    ).values_list('id', 'total_commission', 'total_reservations')
+
+
+def commission_statement(properties_statement):
+    """
+    Commission statement from the per property rows, the global totals are the sum of the rows.
+    """
+    return {
+        'total_commission': sum(row[1] for row in properties_statement),
+        'total_reservations': sum(row[2] for row in properties_statement),
+        'properties_statement': [
+            {
+                'property_id': property_id,
+                'total_commission': total_commission,
+                'total_reservations': total_reservations,
+            }
+            for property_id, total_commission, total_reservations in properties_statement
+        ]
+    }
+
+
+def build_commission_statement(commission_type, year=None, month=None):
+    """ Builds the commission statement of a commission type. """
+    return commission_statement(list(commission_statement_rows(commission_type, year=year, month=month)))
+
+
+async def abuild_commission_statement(commission_type, year=None, month=None):
+    """ build_commission_statement reading the rows with the async ORM. """
+    return commission_statement([
+        row async for row in commission_statement_rows(commission_type, year=year, month=month)
+    ])
@@ -0,0 +1,17 @@
+# Base imports
+from decimal import Decimal
+
+# Third party imports
+from model_bakery.recipe import Recipe
+
+
+# Property with a round price and a 20/10/70 commission split, so the expected totals and
+# commissions of its reservations are exact.
+priced_property = Recipe(
+    'manager.Property',
+    price_per_night=Decimal('100.00'),
+    seazone_commission=0.2,
+    host_commission=0.1,
+    owner_commission=0.7,
+    capacity=4,
+)
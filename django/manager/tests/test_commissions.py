@@ -0,0 +1,77 @@
+# Base imports
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+# Django imports
+from django.db import DatabaseError, connection
+from django.test import TestCase
+
+# Project imports
+from manager.models import (
+    HostCommission,
+    OwnerCommission,
+    Property,
+    Reservation,
+    SeazoneCommission,
+)
+from manager.tests.recipes import priced_property
+
+
+class GenerateCommissionsTestCase(TestCase):
+    """All tests for the commissions generated with a reservation. """
+
+    def setUp(self) -> None:
+        self.property = priced_property.make()
+        return super().setUp()
+
+    def make_reservation(self):
+        return Reservation.objects.create(
+            property=self.property,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 4),
+            client_name='Client',
+            client_email='client@example.com',
+            guests_quantity=1,
+        )
+
+    def test_commission_values(self):
+        reservation = self.make_reservation()
+        self.assertEqual(SeazoneCommission.objects.get(reservation=reservation).commission_value, Decimal('60.00'))
+        self.assertEqual(HostCommission.objects.get(reservation=reservation).commission_value, Decimal('30.00'))
+        self.assertEqual(OwnerCommission.objects.get(reservation=reservation).commission_value, Decimal('210.00'))
+
+    def test_money_stored_in_cents_and_rates_in_basis_points(self):
+        reservation = self.make_reservation()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT commission_percent, commission_value FROM manager_ownercommission WHERE reservation_id = %s',
+                [reservation.id]
+            )
+            self.assertEqual(cursor.fetchone(), (7000, 21000))
+            cursor.execute('SELECT price_per_night, host_commission FROM manager_property')
+            self.assertEqual(cursor.fetchone(), (10000, 1000))
+
+        # Derived in basis points, 1 - (0.1 + 0.7) would be 0.20000000000000007 in floats.
+        self.assertEqual(OwnerCommission.objects.get(reservation=reservation).commission_percent, 0.7)
+        self.assertEqual(Reservation.objects.get().total_price, Decimal('300.00'))
+        self.assertEqual(str(Reservation.objects.get().total_price), '300.00')
+
+    def test_money_lookups_in_cents(self):
+        self.assertTrue(Property.objects.filter(price_per_night__lte=Decimal('100.00')).exists())
+        self.assertFalse(Property.objects.filter(price_per_night__lte='99.99').exists())
+        self.assertTrue(Property.objects.filter(host_commission=0.1).exists())
+
+    def test_host_and_owner_not_fetched(self):
+        # Savepoint, reservation, three commissions, rollup upsert, three rollup increments and release.
+        with self.assertNumQueries(10):
+            self.make_reservation()
+
+    def test_reservation_rolled_back_with_commissions(self):
+        with patch.object(OwnerCommission.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.make_reservation()
+
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(SeazoneCommission.objects.exists())
+        self.assertFalse(HostCommission.objects.exists())
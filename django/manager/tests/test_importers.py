@@ -0,0 +1,133 @@
+# Base imports
+import io
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+# Third party imports
+from model_bakery import baker
+
+# Django imports
+from django.core.management import call_command
+from django.test import TestCase
+
+# Project imports
+from manager.importers import ReservationImporter, read_import_rows
+from manager.models import CommissionRollup, HostCommission, Reservation
+from manager.tests.recipes import priced_property
+
+
+class ReservationImporterTestCase(TestCase):
+    """All tests for the bulk reservation import. """
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+        self.property = priced_property.make()
+        baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2023, 1, 10),
+            end_date=date(2023, 1, 15),
+        )
+        self.header = 'property,client_name,client_email,start_date,end_date,guests_quantity\n'
+        return super().setUp()
+
+    def csv_rows(self, *lines):
+        return read_import_rows(io.StringIO(self.header + ''.join(lines)), 'csv')
+
+    def test_import(self):
+        result = ReservationImporter(chunk_size=2).run(self.csv_rows(
+            f'{self.property.pk},Client 1,client1@example.com,2023-01-01,2023-01-05,2\n',
+            f'{self.property.pk},Client 2,client2@example.com,2023-01-12,2023-01-14,2\n',
+            f'{self.property.pk},Client 3,client3@example.com,2023-01-04,2023-01-08,2\n',
+            f'{self.property.pk},Client 4,client4@example.com,2023-01-05,2023-01-10,9\n',
+            f'9999,Client 5,client5@example.com,2023-01-05,2023-01-10,1\n',
+            f'{self.property.pk},Client 6,not an email,2023-01-05,2023-01-10,1\n',
+            f'{self.property.pk},Client 7,client7@example.com,2023-01-05,2023-01-10,1\n',
+        ))
+
+        self.assertEqual(result['imported'], 2)
+        self.assertEqual(result['last_row'], 7)
+        self.assertEqual(
+            [(error['row'], list(error['errors'])) for error in result['errors']],
+            [(2, ['errors']), (3, ['errors']), (4, ['errors']), (5, ['property']), (6, ['client_email'])]
+        )
+        reservation = Reservation.objects.get(client_name='Client 7')
+        self.assertEqual(reservation.total_price, Decimal('500.00'))
+        self.assertEqual(HostCommission.objects.get(reservation=reservation).commission_value, Decimal('50.00'))
+        self.assertEqual(
+            CommissionRollup.objects.get(commission_type='host', property=self.property, year=2023, month=1)
+            .total_reservations,
+            3
+        )
+
+    def test_import_earlier_row_wins_overlap(self):
+        result = ReservationImporter().run(self.csv_rows(
+            f'{self.property.pk},Client 1,client1@example.com,2023-02-05,2023-02-10,2\n',
+            f'{self.property.pk},Client 2,client2@example.com,2023-02-01,2023-02-06,2\n',
+            f'{self.property.pk},Client 3,client3@example.com,2023-02-01,2023-02-05,2\n',
+            f'{self.property.pk},Client 4,client4@example.com,2023-02-03,2023-02-04,2\n',
+        ))
+
+        self.assertEqual(result['imported'], 2)
+        self.assertEqual([error['row'] for error in result['errors']], [2, 4])
+        self.assertEqual(
+            set(Reservation.objects.filter(start_date__year=2023, start_date__month=2).values_list(
+                'client_name', flat=True
+            )),
+            {'Client 1', 'Client 3'}
+        )
+
+    def test_import_rows_rejected_by_database(self):
+        # Reservations written by someone else between the overlap check and the insert.
+        with patch.object(ReservationImporter, 'reject_overlapping', side_effect=lambda reservations: (reservations, [])):
+            result = ReservationImporter().run(self.csv_rows(
+                f'{self.property.pk},Client 1,client1@example.com,2023-01-01,2023-01-05,2\n',
+                f'{self.property.pk},Client 2,client2@example.com,2023-01-12,2023-01-14,2\n',
+            ))
+
+        self.assertEqual(result['imported'], 1)
+        self.assertEqual(
+            result['errors'],
+            [{'row': 2, 'errors': {'errors': ['The property is not available for the selected dates.']}}]
+        )
+        self.assertTrue(HostCommission.objects.filter(reservation__client_name='Client 1').exists())
+
+    def test_import_ndjson_with_invalid_lines(self):
+        lines = io.StringIO(
+            json.dumps({
+                'property': self.property.pk,
+                'client_name': 'Client 1',
+                'client_email': 'client1@example.com',
+                'start_date': '2023-02-01',
+                'end_date': '2023-02-03',
+                'guests_quantity': 1,
+            }) + '\n\nnot json\n'
+        )
+        result = ReservationImporter().run(read_import_rows(lines, 'ndjson'))
+        self.assertEqual(result['imported'], 1)
+        self.assertEqual(result['errors'], [{'row': 2, 'errors': {'errors': ['Invalid row.']}}])
+
+    def test_command_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reservations.csv')
+            checkpoint = os.path.join(directory, 'checkpoint.json')
+            with open(path, 'w') as import_file:
+                import_file.write(
+                    self.header
+                    + f'{self.property.pk},Client 1,client1@example.com,2023-03-01,2023-03-02,1\n'
+                    + f'{self.property.pk},Client 2,client2@example.com,2023-03-02,2023-03-03,1\n'
+                )
+            with open(checkpoint, 'w') as checkpoint_file:
+                json.dump({'path': path, 'last_row': 1}, checkpoint_file)
+
+            call_command('import_reservations', path, checkpoint=checkpoint, resume=True, stdout=io.StringIO())
+
+            with open(checkpoint) as checkpoint_file:
+                self.assertEqual(json.load(checkpoint_file)['last_row'], 2)
+
+        self.assertFalse(Reservation.objects.filter(client_name='Client 1').exists())
+        self.assertTrue(Reservation.objects.filter(client_name='Client 2').exists())
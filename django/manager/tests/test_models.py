@@ -1,11 +1,23 @@
+# Base imports
+from datetime import date
+
 # Third party imports
 from model_bakery import baker
 
 # Django imports
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 # Project imports
-from manager.models import SeazoneCommission, HostCommission, OwnerCommission
+from manager.models import (
+    SeazoneCommission,
+    HostCommission,
+    OwnerCommission,
+    CommissionRollup,
+    Reservation,
+    StatusChoices,
+)
+from manager.tests.recipes import priced_property
 
 
 class ModelsStrTestCase(TestCase):
@@ -51,3 +63,61 @@ class ModelsStrTestCase(TestCase):
             reservation=reservation
         )
         self.assertEqual(str(owner_commission), owner_commission.__str__())
+
+        commission_rollup = CommissionRollup.objects.filter(
+            property=property_obj
+        ).first()
+        self.assertEqual(str(commission_rollup), commission_rollup.__str__())
+
+
+class ReservationOverlapTestCase(TestCase):
+    """All tests for the database guard against overlapping reservations. """
+
+    def setUp(self) -> None:
+        self.property = priced_property.make()
+        self.reservation = baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 5),
+        )
+        return super().setUp()
+
+    def test_overlapping_reservation_rejected(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                baker.make(
+                    'manager.Reservation',
+                    property=self.property,
+                    start_date=date(2024, 3, 4),
+                    end_date=date(2024, 3, 8),
+                )
+
+    def test_adjacent_reservation_allowed(self):
+        baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 5),
+            end_date=date(2024, 3, 8),
+        )
+        self.assertEqual(Reservation.objects.filter(property=self.property).count(), 2)
+
+    def test_cancelled_reservation_frees_dates(self):
+        self.reservation.status = StatusChoices.CANCELLED
+        self.reservation.save()
+        baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 4),
+            end_date=date(2024, 3, 8),
+        )
+        # Only the confirmed reservations occupy their dates.
+        self.assertFalse(
+            Reservation.objects.filter(property=self.property).overlapping(date(2024, 3, 1), date(2024, 3, 2)).exists()
+        )
+        self.assertEqual(
+            Reservation.objects.filter(property=self.property).overlapping(
+                date(2024, 3, 1), date(2024, 3, 5)
+            ).get().start_date,
+            date(2024, 3, 4)
+        )
@@ -0,0 +1,79 @@
+# Base imports
+from decimal import Decimal
+
+# Django imports
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+from django.test import SimpleTestCase, TestCase
+
+# Third party imports
+from model_bakery import baker
+
+# Project imports
+from manager.models import Property
+from shared.money import (
+    BasisPointsField, MoneyField, apply_basis_points, from_minor_units, to_minor_units, validate_basis_points
+)
+
+
+class MoneyConversionTestCase(SimpleTestCase):
+    """All tests for the minor units and basis points conversions."""
+
+    def test_minor_units(self):
+        self.assertEqual(to_minor_units(Decimal('123.45')), 12345)
+        self.assertEqual(to_minor_units(Decimal('1.005')), 100)
+        self.assertEqual(to_minor_units(Decimal('1.015')), 102)
+        self.assertEqual(from_minor_units(12345), Decimal('123.45'))
+        self.assertEqual(str(from_minor_units(100)), '1.00')
+
+    def test_apply_basis_points_rounds_ties_to_even(self):
+        self.assertEqual(apply_basis_points(1, 5000), 0)
+        self.assertEqual(apply_basis_points(3, 5000), 2)
+        self.assertEqual(apply_basis_points(5, 5000), 2)
+        self.assertEqual(apply_basis_points(7, 5000), 4)
+        self.assertEqual(apply_basis_points(1, 5001), 1)
+        self.assertEqual(apply_basis_points(1, 4999), 0)
+        self.assertEqual(apply_basis_points(10000, 1500), 1500)
+
+    def test_validate_basis_points(self):
+        validate_basis_points(0.1234)
+        validate_basis_points(0.1 + 0.2)
+        with self.assertRaises(ValidationError) as context:
+            validate_basis_points(0.12345)
+        self.assertEqual(context.exception.code, 'basis_points')
+
+    def test_get_db_prep_value(self):
+        money = MoneyField(max_digits=10, decimal_places=2)
+        rate = BasisPointsField()
+        expression = Value(12345)
+        for field in (money, rate):
+            self.assertIsNone(field.get_db_prep_value(None, connection))
+            self.assertIs(field.get_db_prep_value(expression, connection), expression)
+        self.assertEqual(money.get_db_prep_value('20.5', connection), 2050)
+        self.assertEqual(money.get_db_prep_save(Decimal('0.125'), connection), 12)
+        self.assertEqual(rate.get_db_prep_value(0.15, connection), 1500)
+
+
+class MoneyAggregateTestCase(TestCase):
+    """Tests for the aggregates of money fields."""
+
+    def test_sum_and_coalesce(self):
+        output_field = MoneyField(max_digits=14, decimal_places=2)
+        aggregate = Coalesce(Sum('price_per_night'), Value(0), output_field=output_field)
+        self.assertEqual(Property.objects.aggregate(total=aggregate)['total'], Decimal('0.00'))
+        self.assertIsNone(Property.objects.aggregate(total=Sum('price_per_night'))['total'])
+
+        baker.make('manager.Property', price_per_night=Decimal('100.25'))
+        baker.make('manager.Property', price_per_night=Decimal('0.80'))
+        totals = Property.objects.aggregate(total=Sum('price_per_night'), coalesced=aggregate)
+        self.assertEqual(totals, {'total': Decimal('101.05'), 'coalesced': Decimal('101.05')})
+        self.assertEqual(str(totals['total']), '101.05')
+        self.assertEqual(Property.objects.filter(price_per_night__gt=Decimal('100.24')).count(), 1)
+
+    def test_baked_rates_are_valid(self):
+        rate_fields = [field for field in Property._meta.fields if isinstance(field, BasisPointsField)]
+        for property_obj in baker.make('manager.Property', _quantity=20):
+            for field in rate_fields:
+                validate_basis_points(getattr(property_obj, field.name))
@@ -0,0 +1,76 @@
+# Base imports
+from datetime import date
+
+# Django imports
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+# Third party imports
+from model_bakery import baker
+
+# Project imports
+from manager.occupancy import (
+    OCCUPANCY_CACHE_KEY, OCCUPANCY_CACHE_TIMEOUT, OccupancyBitmap, get_property_occupancy
+)
+from shared.cache import get_response_cache
+
+
+class OccupancyBitmapTestCase(SimpleTestCase):
+    """All tests for OccupancyBitmap. """
+
+    def test_window_reads(self):
+        occupancy = OccupancyBitmap.from_periods([
+            (date(2024, 1, 3), date(2024, 1, 5)),
+            (date(2024, 1, 6), date(2024, 1, 7)),
+        ])
+        self.assertEqual(occupancy.days(date(2024, 1, 1), date(2024, 1, 8)), '0011010')
+        self.assertEqual(occupancy.occupied_nights(date(2024, 1, 1), date(2024, 1, 8)), 3)
+        self.assertEqual(occupancy.free_nights(date(2024, 1, 1), date(2024, 1, 8)), 4)
+        self.assertTrue(occupancy.is_free(date(2024, 1, 5), date(2024, 1, 6)))
+        self.assertFalse(occupancy.is_free(date(2024, 1, 4), date(2024, 1, 6)))
+
+    def test_periods_around_epoch(self):
+        occupancy = OccupancyBitmap.from_periods([
+            (date(1999, 12, 30), date(2000, 1, 2)),
+            (date(1999, 12, 20), date(1999, 12, 25)),
+        ])
+        self.assertEqual(occupancy.days(date(2000, 1, 1), date(2000, 1, 4)), '100')
+
+        occupancy = OccupancyBitmap.from_periods([(date(2000, 1, 1), date(2000, 1, 3))])
+        self.assertEqual(occupancy.days(date(2000, 1, 1), date(2000, 1, 4)), '110')
+        with self.assertRaises(ValueError):
+            occupancy.is_free(date(1999, 12, 25), date(1999, 12, 27))
+        with self.assertRaises(ValueError):
+            occupancy.days(date(1999, 12, 30), date(2000, 1, 4))
+
+    def test_merge(self):
+        first = OccupancyBitmap.from_periods([(date(2024, 1, 3), date(2024, 1, 5))])
+        second = OccupancyBitmap.from_periods([(date(2024, 1, 6), date(2024, 1, 7))])
+        self.assertEqual(
+            first | second,
+            OccupancyBitmap.from_periods([
+                (date(2024, 1, 3), date(2024, 1, 5)),
+                (date(2024, 1, 6), date(2024, 1, 7)),
+            ])
+        )
+
+
+class PropertyOccupancyCacheTestCase(TestCase):
+    """Tests for the cached occupancy of a property."""
+
+    def test_invalidated_on_commit(self):
+        reservation = baker.make(
+            'manager.Reservation', start_date=date(2024, 1, 3), end_date=date(2024, 1, 5)
+        )
+        property_id = reservation.property_id
+        self.assertEqual(get_property_occupancy(property_id).days(date(2024, 1, 1), date(2024, 1, 8)), '0011000')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                reservation.start_date = date(2024, 1, 4)
+                reservation.save()
+                # A bitmap cached by another request before the commit.
+                get_response_cache().set(
+                    OCCUPANCY_CACHE_KEY.format(property_id=property_id), 0, timeout=OCCUPANCY_CACHE_TIMEOUT
+                )
+        self.assertEqual(get_property_occupancy(property_id).days(date(2024, 1, 1), date(2024, 1, 8)), '0001000')
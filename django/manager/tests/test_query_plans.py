@@ -0,0 +1,44 @@
+# Base imports
+import io
+import json
+from datetime import date
+
+# Third party imports
+from model_bakery import baker
+
+# Django imports
+from django.core.management import call_command
+from django.test import TestCase
+
+# Project imports
+from manager.tests.recipes import priced_property
+
+
+class QueryPlansTestCase(TestCase):
+    """All tests for the EXPLAIN report of the hot queries. """
+
+    def test_hot_queries_use_their_indexes(self):
+        property_instance = priced_property.make(address_city='São Paulo')
+        baker.make(
+            'manager.Reservation',
+            property=property_instance,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 5),
+            guests_quantity=2,
+        )
+
+        stdout = io.StringIO()
+        call_command('explain_hot_queries', report_format='json', stdout=stdout)
+        report = json.loads(stdout.getvalue())
+
+        self.assertEqual(report['sample']['city_key'], 'sao paulo')
+        self.assertEqual(
+            {query['name']: query['index_used'] for query in report['queries']},
+            {
+                'reservation_overlap': 'manager_reservation_conf_idx',
+                'confirmed_reservation_overlap': 'manager_reservation_conf_idx',
+                'commissions_by_month': 'manager_seazone_comm_date_idx',
+                'property_title_page': 'manager_property_title_idx',
+                'property_city': 'manager_property_city_idx',
+            }
+        )
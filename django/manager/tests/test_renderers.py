@@ -0,0 +1,82 @@
+# Base imports
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+# Django imports
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+
+# Third party imports
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+# Project imports
+from shared.parsers import ORJSONParser
+from shared.renderers import ORJSONRenderer
+
+
+class ORJSONCodecTestCase(SimpleTestCase):
+    """All tests for the orjson renderer and parser. """
+
+    def assertSameRender(self, data, accepted_media_type='application/json'):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def assertSameParse(self, content):
+        try:
+            expected = JSONParser().parse(io.BytesIO(content))
+        except ParseError as exception:
+            with self.assertRaisesMessage(ParseError, str(exception.detail)):
+                ORJSONParser().parse(io.BytesIO(content))
+            return
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(content)), expected)
+
+    def test_render_matches_json_renderer(self):
+        self.assertSameRender({
+            'price_per_night': '120.50',
+            'total_commission': Decimal('1234.10'),
+            'date': date(2024, 3, 1),
+            'utc': datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            'aware': datetime(2024, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=-3))),
+            'naive': datetime(2024, 3, 1, 12, 30, 15),
+            'time': time(8, 15, 30, 500),
+            'duration': timedelta(days=1, seconds=5),
+            'uuid': uuid.UUID(int=1),
+            'message': _('Property not found'),
+            'text': 'São Paulo   line   end',
+            'floats': [0.1, 0.7, 1.5],
+            'nested': ReturnList([ReturnDict({'id': 1, 'values': {3, 4}}, serializer=None)], serializer=None),
+            1: 'integer key',
+            'big': 2 ** 70,
+        })
+        self.assertSameRender({'id': 1}, 'application/json; indent=4')
+        self.assertSameRender([])
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_render_non_finite_numbers_like_json_renderer(self):
+        for value in (float('nan'), float('inf'), -float('inf'), Decimal('NaN')):
+            data = {'id': 1, 'missing': None, 'values': [1.5, value]}
+            try:
+                expected = JSONRenderer().render(data)
+            except ValueError as exception:
+                with self.assertRaisesMessage(ValueError, str(exception)):
+                    ORJSONRenderer().render(data)
+                continue
+            self.assertEqual(ORJSONRenderer().render(data), expected)
+
+        renderer, json_renderer = ORJSONRenderer(), JSONRenderer()
+        renderer.strict = json_renderer.strict = False
+        self.assertEqual(renderer.render({'value': float('nan')}), json_renderer.render({'value': float('nan')}))
+
+    def test_parse_matches_json_parser(self):
+        self.assertSameParse(b'{"client_name": "Jo\xc3\xa3o", "guests_quantity": 2, "price": 1.5, "ok": true}')
+        self.assertSameParse(b'[18446744073709551617]')
+        self.assertSameParse(b'{"value": NaN}')
+        self.assertSameParse(b'{"broken": ')
+        self.assertSameParse(b'')
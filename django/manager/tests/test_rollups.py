@@ -0,0 +1,128 @@
+# Base imports
+import io
+from datetime import date
+from decimal import Decimal
+
+# Third party imports
+from model_bakery import baker
+
+# Django imports
+from django.core.management import call_command
+from django.test import TestCase
+
+# Project imports
+from manager.models import CommissionRollup, Reservation, SeazoneCommission, StatusChoices
+from manager.tests.recipes import priced_property
+
+
+class CommissionRollupTestCase(TestCase):
+    """All tests for the monthly commission rollups. """
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+        self.owner = baker.make('manager.Owner')
+        self.host = baker.make('manager.Host')
+        self.property = priced_property.make(owner=self.owner, host=self.host)
+        self.reservation = baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 5),
+        )
+        baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 10),
+            end_date=date(2024, 3, 12),
+        )
+        return super().setUp()
+
+    def get_rollups(self):
+        return {
+            (rollup.commission_type, rollup.year, rollup.month): (
+                rollup.total_commission, rollup.total_reservations
+            )
+            for rollup in CommissionRollup.objects.filter(property=self.property)
+        }
+
+    def test_rollups_incremented_on_create(self):
+        self.assertEqual(
+            self.get_rollups(),
+            {
+                ('seazone', 2024, 3): (Decimal('120.00'), 2),
+                ('host', 2024, 3): (Decimal('60.00'), 2),
+                ('owner', 2024, 3): (Decimal('420.00'), 2),
+            }
+        )
+
+    def test_rollups_decremented_on_cancel(self):
+        self.reservation.status = StatusChoices.CANCELLED
+        self.reservation.save()
+        self.reservation.save()
+        self.assertEqual(
+            self.get_rollups(),
+            {
+                ('seazone', 2024, 3): (Decimal('40.00'), 1),
+                ('host', 2024, 3): (Decimal('20.00'), 1),
+                ('owner', 2024, 3): (Decimal('140.00'), 1),
+            }
+        )
+
+    def test_commissions_zeroed_on_cancel_and_regenerated_on_confirm(self):
+        expected = self.get_rollups()
+        self.reservation.status = StatusChoices.CANCELLED
+        self.reservation.save()
+        self.assertEqual(SeazoneCommission.objects.get(reservation=self.reservation).commission_value, Decimal('0.00'))
+
+        self.reservation.status = StatusChoices.CONFIRMED
+        self.reservation.save()
+        self.assertEqual(self.get_rollups(), expected)
+        self.assertEqual(SeazoneCommission.objects.get(reservation=self.reservation).commission_value, Decimal('80.00'))
+
+    def test_rollups_decremented_on_delete(self):
+        expected = {
+            ('seazone', 2024, 3): (Decimal('40.00'), 1),
+            ('host', 2024, 3): (Decimal('20.00'), 1),
+            ('owner', 2024, 3): (Decimal('140.00'), 1),
+        }
+        self.reservation.delete()
+        self.assertEqual(self.get_rollups(), expected)
+
+        cancelled = baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 20),
+            end_date=date(2024, 3, 22),
+            status=StatusChoices.CANCELLED,
+        )
+        cancelled.delete()
+        self.assertEqual(self.get_rollups(), expected)
+
+        Reservation.objects.filter(property=self.property).delete()
+        self.assertEqual(
+            set(self.get_rollups().values()),
+            {(Decimal('0.00'), 0)}
+        )
+
+    def test_rebuild_command(self):
+        expected = self.get_rollups()
+        CommissionRollup.objects.all().delete()
+        call_command('rebuild_commission_rollups', stdout=io.StringIO())
+        self.assertEqual(self.get_rollups(), expected)
+
+    def test_rebuild_command_month(self):
+        baker.make(
+            'manager.Reservation',
+            property=self.property,
+            start_date=date(2024, 3, 28),
+            end_date=date(2024, 4, 2),
+        )
+        expected = self.get_rollups()
+        CommissionRollup.objects.filter(month=4).update(total_commission=0, total_reservations=0)
+        CommissionRollup.objects.filter(month=3).delete()
+
+        call_command('rebuild_commission_rollups', year=2024, month=3, stdout=io.StringIO())
+        self.assertEqual(CommissionRollup.objects.filter(month=4, total_reservations=0).count(), 3)
+
+        call_command('rebuild_commission_rollups', year=2024, month=4, stdout=io.StringIO())
+        self.assertEqual(self.get_rollups(), expected)
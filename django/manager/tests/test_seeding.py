@@ -0,0 +1,97 @@
+# Base imports
+import io
+import json
+from decimal import Decimal
+
+# Django imports
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+
+# Project imports
+from manager.models import (
+    CommissionRollup,
+    HostCommission,
+    Owner,
+    Property,
+    Reservation,
+    SeazoneCommission,
+    StatusChoices,
+)
+
+
+class SeedDataTestCase(TestCase):
+    """All tests for the synthetic data generator and the benchmark runner. """
+
+    def seed(self, **options):
+        stdout = io.StringIO()
+        call_command(
+            'seed_data', owners=3, hosts=2, properties=5, reservations=40, batch_size=7, stdout=stdout, **options
+        )
+        return json.loads(stdout.getvalue())
+
+    @staticmethod
+    def snapshot():
+        return (
+            list(Property.objects.order_by('id').values_list('title', 'address_city', 'price_per_night', 'capacity')),
+            list(Reservation.objects.order_by('id').values_list('start_date', 'end_date', 'status', 'total_price')),
+        )
+
+    def test_seed_data(self):
+        self.assertEqual(
+            self.seed(),
+            {
+                'owners': 3,
+                'hosts': 2,
+                'properties': 5,
+                'reservations': 40,
+                'commissions': 120,
+                'commission_rollups': CommissionRollup.objects.count(),
+            }
+        )
+        self.assertEqual(Owner.objects.count(), 3)
+        self.assertEqual(HostCommission.objects.count(), 40)
+        self.assertFalse(Property.objects.filter(city_key='').exists())
+
+        for reservation in Reservation.objects.select_related('property'):
+            self.assertEqual(
+                reservation.total_price,
+                reservation.property.price_per_night * (reservation.end_date - reservation.start_date).days
+            )
+            self.assertFalse(
+                Reservation.objects.filter(property=reservation.property).exclude(id=reservation.id).overlapping(
+                    reservation.start_date, reservation.end_date
+                ).exists()
+            )
+
+        self.assertEqual(
+            CommissionRollup.objects.filter(commission_type='seazone').aggregate(total=Sum('total_commission'))['total'],
+            SeazoneCommission.objects.filter(
+                reservation__status=StatusChoices.CONFIRMED
+            ).aggregate(total=Sum('commission_value'))['total'] or Decimal('0')
+        )
+
+    def test_seed_data_reproducible(self):
+        self.seed(seed=7)
+        expected = self.snapshot()
+        Owner.objects.all().delete()
+
+        self.seed(seed=7)
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_run_benchmarks(self):
+        self.seed()
+        stdout = io.StringIO()
+        call_command(
+            'run_benchmarks', endpoint=['properties_list', 'property_availability'], requests=3, warmup=0,
+            stdout=stdout
+        )
+        results = json.loads(stdout.getvalue())
+
+        self.assertEqual(results['rows']['manager_reservation'], 40)
+        self.assertEqual(set(results['endpoints']), {'properties_list', 'property_availability'})
+        properties_list = results['endpoints']['properties_list']
+        self.assertEqual(properties_list['statuses'], {'200': 3})
+        self.assertGreater(properties_list['queries']['mean'], 0)
+        self.assertGreater(properties_list['peak_memory_kb'], 0)
+        self.assertLessEqual(properties_list['latency_ms']['p50'], properties_list['latency_ms']['p99'])
@@ -5,6 +5,8 @@ from decimal import Decimal
 from typing import List
 
 # Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # Third party imports
@@ -67,6 +69,15 @@ class PropertyViewSetTestCase(BaseAPITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_invalid_month_financial(self):
+        response = self.get(
+            f'{self.url}'
+            '?type=seazone'
+            '&year=2024'
+            '&month=13'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_type_seazone(self):
         response = self.get(
             f'{self.url}'
@@ -120,3 +131,69 @@ class PropertyViewSetTestCase(BaseAPITestCase):
                 'properties_statement': [{'property_id': 1, 'total_commission': 844.62, 'total_reservations': 1}]
             }
         )
+
+    def test_properties_without_commissions(self):
+        property_two = baker.make(
+            'manager.Property',
+            title='Item2',
+            host=self.host,
+            owner=self.owner,
+        )
+        response = self.get(
+            f'{self.url}'
+            '?type=seazone'
+            '&year=2024'
+            '&month=03'
+        )
+        contents = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            contents,
+            {
+                'total_commission': 120.66,
+                'total_reservations': 1,
+                'properties_statement': [
+                    {'property_id': self.property.pk, 'total_commission': 120.66, 'total_reservations': 1},
+                    {'property_id': property_two.pk, 'total_commission': 0.0, 'total_reservations': 0},
+                ]
+            }
+        )
+
+    def test_query_count_does_not_grow_with_properties(self):
+        url = f'{self.url}?type=host&year=2024&month=03'
+        self.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get(url)
+        queries_with_one_property = len(context.captured_queries)
+
+        baker.make(
+            'manager.Property',
+            host=self.host,
+            owner=self.owner,
+            _quantity=30
+        )
+        with self.assertNumQueries(queries_with_one_property):
+            response = self.get(url)
+
+        contents = json.loads(response.content)
+        self.assertEqual(len(contents['properties_statement']), 31)
+
+    def test_export_statement(self):
+        url = reverse('financial-export')
+        response = self.client.get(f'{url}?type=seazone&year=2024&month=03')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            b''.join(response.streaming_content).decode().splitlines(),
+            ['property_id,total_commission,total_reservations', f'{self.property.pk},120.66,1']
+        )
+
+        response = self.client.get(f'{url}?type=host&export_format=ndjson')
+        self.assertEqual(
+            [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()],
+            [{'property_id': self.property.pk, 'total_commission': '844.62', 'total_reservations': 1}]
+        )
+
+        response = self.client.get(f'{url}?type=other')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,65 @@
+# Base imports
+import re
+
+# Django imports
+from django.urls import reverse
+
+# Third party imports
+from rest_framework import status
+
+# Project imports
+from manager.tests.recipes import priced_property
+from shared.tests import BaseAPITestCase
+
+
+class MetricsTestCase(BaseAPITestCase):
+    """Test all scenarios for the Prometheus metrics endpoint."""
+
+    tests_to_perform = []
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = reverse('metrics')
+        self.property = priced_property.make()
+
+    def get_sample(self, name, view):
+        content = self.client.get(self.url).content.decode()
+        match = re.search(rf'^{name}{{view="{view}",method="GET"[^}}]*}} (\S+)$', content, re.MULTILINE)
+        return float(match.group(1)) if match else 0
+
+    def test_metrics_forbidden(self):
+        response = self.client.get(self.url, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_request_metrics(self):
+        requests = self.get_sample('http_request_duration_seconds_count', 'property-list')
+        queries = self.get_sample('http_request_db_queries_sum', 'property-list')
+        availability = self.get_sample('http_request_duration_seconds_count', 'property-availability')
+
+        self.assertEqual(self.get(reverse('property-list')).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get(
+                f'{reverse("property-availability")}?property_id={self.property.id}'
+                '&start_date=2024-03-01&end_date=2024-03-05&guests_quantity=2'
+            ).status_code,
+            status.HTTP_200_OK
+        )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        self.assertEqual(self.get_sample('http_request_duration_seconds_count', 'property-list'), requests + 1)
+        self.assertGreater(self.get_sample('http_request_db_queries_sum', 'property-list'), queries)
+        self.assertGreater(self.get_sample('http_request_serializer_duration_seconds_sum', 'property-list'), 0)
+        self.assertGreater(self.get_sample('http_response_size_bytes_sum', 'property-list'), 0)
+        self.assertEqual(
+            self.get_sample('http_request_duration_seconds_count', 'property-availability'), availability + 1
+        )
+        self.assertIn('response_cache_hits_total{worker=', response.content.decode())
+        self.assertIn('db_connections_opened_total{worker=', response.content.decode())
+
+    async def test_async_request_metrics(self):
+        requests = self.get_sample('http_request_duration_seconds_count', 'health_auth')
+        response = await self.async_client.get(reverse('health_auth'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_sample('http_request_duration_seconds_count', 'health_auth'), requests + 1)
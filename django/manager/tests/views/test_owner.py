@@ -1,14 +1,20 @@
 # Base imports
+import json
 from typing import List
 
 # Django imports
 from django.urls import reverse
+from django.utils import timezone
 
 # Third party imports
+from rest_framework import status
 from model_bakery import baker
 
 
 # Project imports
+from authentication.models import User
+from manager.models import Owner
+from shared.cache import response_cache_stats
 from shared.tests import BaseAPITestCase
 
 
@@ -80,3 +86,49 @@ class OwnerViewSetTestCase(BaseAPITestCase):
                 'field_first_row_value': self.row_object_two.pk
             }
         ]
+
+    def test_response_cache(self):
+        url = f'{self.url}?page_size=10&page=1'
+        stats = response_cache_stats.snapshot()
+
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.get(f'{self.url}?page=1&page_size=10')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], 'Item1')
+        self.assertEqual(
+            response_cache_stats.snapshot(),
+            {'hits': stats['hits'] + 1, 'misses': stats['misses'] + 1}
+        )
+
+        self.row_object.name = 'Item0'
+        self.row_object.save()
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], 'Item0')
+
+        # Updates without signals keep the version, the ETag of the rows still tells the cached data apart.
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        Owner.objects.filter(pk=self.row_object.pk).update(name='Item00', updated_at=timezone.now())
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], 'Item00')
+        etag = response['ETag']
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response['ETag'], etag)
+
+        other_user = User.objects.create(username='usuario2', email='usuario2@teste.com')
+        self.client.force_authenticate(other_user)
+        self.assertEqual(self.get(url)['X-Cache'], 'MISS')
+
+    def test_response_cache_stats(self):
+        url = reverse('response-cache-stats')
+        self.assertEqual(self.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(json.loads(response.content)), {'hits', 'misses'})
@@ -4,16 +4,26 @@ from copy import deepcopy
 from datetime import datetime
 from decimal import Decimal
 from typing import List
+from unittest.mock import patch
 
 # Django imports
-from django.urls import reverse
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 
 # Third party imports
+from asgiref.sync import async_to_sync, iscoroutinefunction
 from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
 from model_bakery import baker
 
 # Project imports
 from manager.serializers import OwnerSerializer, HostSerializer
+from manager.views.financial import CommissionViewSet
+from manager.views.property import PropertyViewSet
+from shared.cache import get_response_cache
+from shared.helpers import KeysetPaginationClass
 from shared.tests import BaseAPITestCase
 
 
@@ -251,3 +261,309 @@ class PropertyViewSetTestCase(BaseAPITestCase):
             contents['description']['detail'],
         {"errors":["The sum of seazone_commission, host_commission, and owner_commission must equal 1."]}
         )
+
+    def test_create_property_commission_precision(self):
+        data = deepcopy(self.post_data)
+        data['seazone_commission'] = 0.10005
+        data['owner_commission'] = 0.69995
+        response = self.post(self.url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('4 decimal places', response.content.decode())
+
+        data['seazone_commission'] = 0.1005
+        data['owner_commission'] = 0.6995
+        response = self.post(self.url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_availability_search(self):
+        baker.make(
+            'manager.Reservation',
+            property=self.row_object,
+            start_date=datetime.strptime('2024-01-30', '%Y-%m-%d').date(),
+            end_date=datetime.strptime('2024-03-30', '%Y-%m-%d').date(),
+        )
+        url = reverse('property-availability-search')
+        data = {
+            'date_ranges': [
+                {'start_date': '2024-01-01', 'end_date': '2024-02-01'},
+                {'start_date': '2024-03-30', 'end_date': '2024-04-05'},
+            ],
+            'guests_quantity': 1,
+        }
+        response = self.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(
+            contents['results'],
+            [
+                {'start_date': '2024-01-01', 'end_date': '2024-02-01', 'property_ids': [self.row_object_two.pk]},
+                {
+                    'start_date': '2024-03-30',
+                    'end_date': '2024-04-05',
+                    'property_ids': [self.row_object.pk, self.row_object_two.pk]
+                },
+            ]
+        )
+
+        data['guests_quantity'] = 15
+        response = self.post(url, data)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['results'][0]['property_ids'], [])
+        self.assertEqual(contents['results'][1]['property_ids'], [self.row_object.pk])
+
+        data['guests_quantity'] = 1
+        data['property_ids'] = [self.row_object.pk]
+        response = self.post(url, data)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['results'][1]['property_ids'], [self.row_object.pk])
+
+        del data['property_ids']
+        response = self.post(f'{url}?address_city={self.row_object_two.address_city}', data)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['results'][1]['property_ids'], [self.row_object_two.pk])
+
+        # Every range is answered by the same query.
+        data['date_ranges'] = data['date_ranges'] * 20
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(url, data)
+        self.assertEqual(len(json.loads(response.content)['results']), 40)
+        self.assertEqual(
+            len([query for query in context.captured_queries if 'manager_reservation' in query['sql']]), 1
+        )
+
+    def test_availability_search_invalid_range(self):
+        url = reverse('property-availability-search')
+        data = {
+            'date_ranges': [{'start_date': '2024-02-01', 'end_date': '2024-01-01'}],
+            'guests_quantity': 1,
+        }
+        response = self.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_quote(self):
+        url = reverse('property-quote')
+        stay = {'property': self.row_object.pk, 'start_date': '2024-01-01', 'end_date': '2024-03-01', 'guests_quantity': 2}
+        data = {
+            'stays': [
+                stay,
+                {**stay, 'property': 3434343},
+                {**stay, 'guests_quantity': 21},
+            ],
+        }
+        # The user and the properties.
+        with self.assertNumQueries(2):
+            response = self.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(
+            contents['results'],
+            [
+                {
+                    **stay,
+                    'nights': 60,
+                    'total_price': '1206.60',
+                    'seazone_commission': '120.66',
+                    'host_commission': '844.62',
+                    'owner_commission': '241.32',
+                },
+                {**stay, 'property': 3434343, 'errors': ['Property not found.']},
+                {
+                    **stay,
+                    'guests_quantity': 21,
+                    'errors': ['The number of guests exceeds the maximum capacity of the property.'],
+                },
+            ]
+        )
+
+        # Same values as a saved reservation and its commissions.
+        reservation = baker.make(
+            'manager.Reservation',
+            property=self.row_object,
+            start_date=datetime.strptime('2024-01-01', '%Y-%m-%d').date(),
+            end_date=datetime.strptime('2024-03-01', '%Y-%m-%d').date(),
+        )
+        reservation.refresh_from_db()
+        self.assertEqual(str(reservation.total_price), contents['results'][0]['total_price'])
+        self.assertEqual(
+            str(reservation.owner_commission.commission_value), contents['results'][0]['owner_commission']
+        )
+
+    def test_quote_invalid_stay(self):
+        url = reverse('property-quote')
+        data = {
+            'stays': [
+                {'property': self.row_object.pk, 'start_date': '2024-02-01', 'end_date': '2024-01-01', 'guests_quantity': 1},
+            ],
+        }
+        response = self.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post(url, {'stays': []})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_calendar(self):
+        get_response_cache().clear()
+        baker.make(
+            'manager.Reservation',
+            property=self.row_object,
+            start_date=datetime.strptime('2024-01-03', '%Y-%m-%d').date(),
+            end_date=datetime.strptime('2024-01-05', '%Y-%m-%d').date(),
+        )
+        url = reverse('property-calendar', args=[self.row_object.pk])
+        response = self.get(f'{url}?from=2024-01-01&to=2024-01-08')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(
+            contents,
+            {
+                'property_id': self.row_object.pk,
+                'from': '2024-01-01',
+                'to': '2024-01-08',
+                'nights': 7,
+                'occupied_nights': 2,
+                'free_nights': 5,
+                'occupancy': '0011000',
+            }
+        )
+
+        baker.make(
+            'manager.Reservation',
+            property=self.row_object,
+            start_date=datetime.strptime('2024-01-07', '%Y-%m-%d').date(),
+            end_date=datetime.strptime('2024-01-10', '%Y-%m-%d').date(),
+        )
+        response = self.get(f'{url}?from=2024-01-01&to=2024-01-08')
+        contents = json.loads(response.content)
+        self.assertEqual(contents['occupancy'], '0011001')
+
+    def test_calendar_invalid_window(self):
+        url = reverse('property-calendar', args=[self.row_object.pk])
+        response = self.get(f'{url}?from=2024-01-01&to=2027-01-01')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.get(f'{url}?from=2024-01-01&to=nodate')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.get(f'{url}?from=1999-12-30&to=2000-01-04')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        url = reverse('property-calendar', args=[9999])
+        response = self.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_keyset_pagination(self):
+        row_object_three = baker.make(
+            'manager.Property',
+            title='Item1',
+            host=self.host,
+            owner=self.owner,
+        )
+        response = self.get(f'{self.url}?cursor=&page_size=2&count=exact')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['count'], 3)
+        self.assertEqual(
+            [row['id'] for row in contents['results']],
+            [self.row_object.pk, row_object_three.pk]
+        )
+
+        response = self.client.get(contents['next'])
+        contents = json.loads(response.content)
+        self.assertNotIn('count', contents)
+        self.assertIsNone(contents['next'])
+        self.assertEqual([row['id'] for row in contents['results']], [self.row_object_two.pk])
+
+        response = self.get(f'{self.url}?cursor=invalid')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        for position in (['x'], [{'a': 1}], [None], ['Item1', 'x'], ['Item1', None]):
+            cursor = KeysetPaginationClass.encode_cursor(position)
+            response = self.get(f'{self.url}?cursor={cursor}')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_without_multivalued_join_is_not_distinct(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(f'{self.url}?search=Item&address_city={self.row_object.address_city}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('DISTINCT' in query['sql'] for query in context.captured_queries))
+
+    def test_search_on_multivalued_join_is_deduplicated(self):
+        for day in (1, 10):
+            baker.make(
+                'manager.Reservation',
+                property=self.row_object,
+                client_name='Guest',
+                start_date=datetime(2024, 1, day).date(),
+                end_date=datetime(2024, 1, day + 2).date(),
+            )
+
+        class PropertyByGuestViewSet(PropertyViewSet):
+            search_fields = ('title', 'reservations__client_name')
+
+        view = PropertyByGuestViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get(self.url, {'search': 'Guest'})
+        force_authenticate(request, user=self.user)
+        response = view(request)
+        self.assertEqual([row['id'] for row in response.data], [self.row_object.pk])
+
+    @patch.object(PropertyViewSet, 'response_cache_models', ())
+    def test_values_list_matches_serializer(self):
+        for url in (self.url, f'{self.url}?page_size=1&page=2', f'{self.url}?cursor=&page_size=1'):
+            response = self.get(url)
+            with patch.object(PropertyViewSet, 'values_list_enabled', False):
+                serializer_response = self.get(url)
+            self.assertEqual(response.content, serializer_response.content)
+
+    def test_location_match(self):
+        self.row_object.address_city = 'São  Paulo'
+        self.row_object.save()
+        self.row_object_two.address_city = 'Rio Grande'
+        self.row_object_two.save()
+
+        def filter_ids(query):
+            response = self.get(f'{self.url}?{query}')
+            return [row['id'] for row in json.loads(response.content)]
+
+        self.assertEqual(filter_ids('address_city=SAO PAULO&location_match=exact'), [self.row_object.pk])
+        self.assertEqual(filter_ids('address_city=Paulo&location_match=exact'), [])
+        self.assertEqual(filter_ids('address_city=rio g&location_match=prefix'), [self.row_object_two.pk])
+        self.assertEqual(filter_ids('address_city=grande&location_match=prefix'), [])
+        self.assertEqual(filter_ids('address_city=Grande'), [self.row_object_two.pk])
+
+        response = self.get(f'{self.url}?address_city=Rio&location_match=fuzzy')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_read_routes_are_sync_without_async_views(self):
+        for url in (self.url, reverse('property-detail', args=[self.row_object.pk]), reverse('financial-list')):
+            self.assertFalse(iscoroutinefunction(resolve(url).func), url)
+
+    @override_settings(ASYNC_VIEWS=True)
+    def test_async_views(self):
+        availability_params = {
+            'property_id': self.row_object.pk,
+            'start_date': '2024-01-01',
+            'end_date': '2024-02-01',
+            'guests_quantity': 1,
+        }
+        for viewset, actions, url, params, kwargs in (
+            (PropertyViewSet, {'get': 'list'}, self.url, {'page_size': 1}, {}),
+            (PropertyViewSet, {'get': 'retrieve'}, self.url, {}, {'pk': self.row_object.pk}),
+            (PropertyViewSet, {'get': 'retrieve'}, self.url, {}, {'pk': 0}),
+            (PropertyViewSet, {'get': 'availability'}, self.url, availability_params, {}),
+            (PropertyViewSet, {'get': 'availability'}, self.url, {**availability_params, 'property_id': 0}, {}),
+            (CommissionViewSet, {'get': 'list'}, reverse('financial-list'), {'type': 'host'}, {}),
+        ):
+            view = viewset.as_view(actions)
+            self.assertTrue(iscoroutinefunction(view), actions)
+            with self.settings(ASYNC_VIEWS=False):
+                sync_view = viewset.as_view(actions)
+            responses = []
+            for handler in (async_to_sync(view), sync_view):
+                request = APIRequestFactory().get(url, params)
+                force_authenticate(request, user=self.user)
+                responses.append(handler(request, **kwargs))
+            response, sync_response = responses
+            self.assertEqual(response.status_code, sync_response.status_code, actions)
+            self.assertEqual(response.data, sync_response.data, actions)
+
+        self.assertFalse(iscoroutinefunction(PropertyViewSet.as_view({'post': 'availability_search'})))
@@ -4,16 +4,28 @@ from copy import deepcopy
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List
+from unittest.mock import patch
 
 # Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # Third party imports
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from model_bakery import baker
 
 # Project imports
-from manager.serializers import PropertyOnlySerializer, OwnerSerializer, HostSerializer
+from manager.serializers import (
+    PropertyOnlySerializer,
+    OwnerSerializer,
+    HostSerializer,
+    ReservationCreateSerializer
+)
+from manager.views.reservation import ReservationViewSet
+from shared.helpers import KeysetPaginationClass
+from shared.renderers import ORJSONRenderer
 from shared.tests import BaseAPITestCase
 
 
@@ -195,3 +207,232 @@ class ReservationViewSetTestCase(BaseAPITestCase):
         {"errors":["The property is not available for the selected dates."]}
         )
 
+
+    def test_cancel_reservation(self):
+        url = reverse('reservation-cancel', args=[self.row_object.pk])
+        response = self.post(url, {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['status'], 'Cancelled')
+        self.assertEqual(
+            [contents['seazone_commission'], contents['host_commission'], contents['owner_commission']],
+            [0.0, 0.0, 0.0]
+        )
+        self.assertEqual(contents['total_price'], '1206.60')
+
+        # The financial statement no longer counts it.
+        response = self.get(f"{reverse('financial-list')}?type=host")
+        contents = json.loads(response.content)
+        self.assertEqual([contents['total_commission'], contents['total_reservations']], [422.31, 1])
+
+        # The dates are free again.
+        availability = reverse('property-availability')
+        response = self.get(
+            f'{availability}?property_id={self.property.pk}&start_date=2024-02-01&end_date=2024-02-05&guests_quantity=1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.post(url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post(reverse('reservation-cancel', args=[3434343]), {})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_keeps_total_price(self):
+        self.property.price_per_night = Decimal('999.99')
+        self.property.save()
+        response = self.post(reverse('reservation-cancel', args=[self.row_object.pk]), {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['total_price'], '1206.60')
+        self.row_object.refresh_from_db()
+        self.assertEqual(self.row_object.total_price, Decimal('1206.60'))
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        url = f'{self.url}?page_size=100'
+        self.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get(url)
+        queries_with_two_reservations = len(context.captured_queries)
+
+        start_date = datetime.strptime('2025-01-01', '%Y-%m-%d').date()
+        for index in range(20):
+            baker.make(
+                'manager.Reservation',
+                property=self.property,
+                start_date=start_date + timedelta(days=index * 2),
+                end_date=start_date + timedelta(days=index * 2 + 1),
+            )
+        with self.assertNumQueries(queries_with_two_reservations):
+            response = self.get(url)
+
+        contents = json.loads(response.content)
+        self.assertEqual(len(contents['results']), 22)
+
+    def test_reservation_overlap_rejected_by_database(self):
+        data = deepcopy(self.post_data)
+        response = self.post(
+            self.url, data
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # A concurrent request that passed the overlap validation before the first one committed.
+        with patch.object(ReservationCreateSerializer, 'validate', lambda serializer, attrs: attrs):
+            response = self.post(
+                self.url, data
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        contents = json.loads(response.content)
+        self.assertEqual(
+            contents['description']['detail'],
+        {"errors":["The property is not available for the selected dates."]}
+        )
+
+    def test_import_reservations(self):
+        url = reverse('reservation-import-reservations')
+        body = (
+            'property,client_name,client_email,start_date,end_date,guests_quantity\n'
+            f'{self.property.pk},Item4,Item4@example.com,2023-01-01,2023-01-05,1\n'
+            f'{self.property.pk},Item5,Item5@example.com,2024-02-01,2024-02-05,1\n'
+        )
+        response = self.client.post(url, data=body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contents = json.loads(response.content)
+        self.assertEqual(contents['imported'], 1)
+        self.assertEqual(contents['last_row'], 2)
+        self.assertEqual(
+            contents['errors'],
+            [{'row': 2, 'errors': {'errors': ['The property is not available for the selected dates.']}}]
+        )
+
+        response = self.client.post(url, data=body, content_type='application/xml')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_export_reservations(self):
+        url = reverse('reservation-export')
+        response = self.client.get(f'{url}?search=Item1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines,
+            [
+                'id,property_id,property_title,owner_id,host_id,client_name,client_email,start_date,end_date,'
+                'guests_quantity,total_price,status,seazone_commission,host_commission,owner_commission',
+                f'{self.row_object.pk},{self.property.pk},Item1,{self.owner.pk},{self.host.pk},Item1,'
+                f'Item1@example.com,2024-01-30,2024-03-30,{self.row_object.guests_quantity},1206.60,Confirmed,'
+                '120.66,844.62,241.32',
+            ]
+        )
+
+        response = self.client.get(f'{url}?export_format=ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.row_object.pk, self.row_object_two.pk])
+        self.assertEqual(rows[0]['seazone_commission'], '120.66')
+
+        response = self.client.get(f'{url}?export_format=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_export_reservations_asgi(self):
+        url = reverse('reservation-export')
+        response = await self.async_client.get(
+            f'{url}?export_format=ndjson', headers={'authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.row_object.pk, self.row_object_two.pk])
+
+    def test_keyset_pagination(self):
+        response = self.get(f'{self.url}?cursor=&page_size=1&search=Item')
+        contents = json.loads(response.content)
+        self.assertEqual([row['id'] for row in contents['results']], [self.row_object.pk])
+
+        response = self.client.get(contents['next'])
+        contents = json.loads(response.content)
+        self.assertEqual([row['id'] for row in contents['results']], [self.row_object_two.pk])
+        self.assertIsNone(contents['next'])
+
+        for position in (['x'], [{'a': 1}], [None]):
+            response = self.get(f'{self.url}?cursor={KeysetPaginationClass.encode_cursor(position)}')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_values_list_matches_serializer(self):
+        url = f'{self.url}?page_size=10'
+        response = self.get(url)
+        with patch.object(ReservationViewSet, 'values_list_enabled', False):
+            serializer_response = self.get(url)
+        self.assertEqual(response.content, serializer_response.content)
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        url = f'{self.url}?page_size=10'
+        response = self.get(url)
+        with patch.object(ReservationViewSet, 'renderer_classes', [JSONRenderer]):
+            json_response = self.get(url)
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertIsInstance(json_response.accepted_renderer, JSONRenderer)
+        self.assertEqual(response.content, json_response.content)
+
+    def test_indexed_search(self):
+        def search(term):
+            response = self.get(f'{self.url}?search={term}')
+            return [row['id'] for row in json.loads(response.content)]
+
+        self.assertEqual(search('item2@EXAMPLE'), [self.row_object_two.pk])
+        self.assertEqual(search('tem2'), [self.row_object_two.pk])
+        self.assertEqual(search('2'), [self.row_object_two.pk])
+        self.assertEqual(search('Item1 example'), [self.row_object.pk])
+
+        self.row_object.client_name = 'Renamed'
+        self.row_object.save()
+        self.assertEqual(search('Renamed'), [self.row_object.pk])
+        self.assertEqual(search('Item1'), [self.row_object.pk])
+
+        self.row_object_two.delete()
+        self.assertEqual(search('Item2'), [])
+
+    def test_conditional_get(self):
+        url = f'{self.url}?page_size=10'
+        response = self.get(url)
+        etag = response['ETag']
+
+        with (
+            patch.object(ReservationViewSet, 'get_serializer') as get_serializer,
+            patch.object(ReservationViewSet, 'values_list') as values_list,
+        ):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        get_serializer.assert_not_called()
+        values_list.assert_not_called()
+
+        self.row_object.client_name = 'Renamed'
+        self.row_object.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        detail_url = reverse('reservation-detail', args=[self.row_object_two.pk])
+        response = self.get(detail_url)
+        response = self.client.get(detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(reverse('reservation-detail', args=[0]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conditional_get_varies_with_query_and_commissions(self):
+        url = f'{self.url}?page_size=1'
+        etag = self.get(url)['ETag']
+        for other_url in (f'{url}&page=2', f'{url}&ordering=-id', f'{self.url}?cursor=&page_size=1'):
+            response = self.client.get(other_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, other_url)
+            self.assertNotEqual(response['ETag'], etag, other_url)
+
+        commission = self.row_object.seazone_commission
+        commission.commission_value = Decimal('1.00')
+        commission.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,63 @@
+"""
+SQL of the SQLite triggers on the manager tables, for the migrations that create them. SQLite
+drops the triggers of a table when a migration rebuilds it, so those migrations create them
+again from here. The migrations run this SQL, change it only along with a new migration.
+"""
+
+# Columns of the FTS5 search table of each searched table, see IndexedSearchFilter.
+SEARCH_COLUMNS = {
+    'manager_owner': ('name',),
+    'manager_host': ('name',),
+    'manager_property': ('title',),
+    'manager_reservation': ('client_name', 'client_email'),
+}
+
+
+def drop_triggers_sql(names, if_exists=False):
+    if_exists = 'IF EXISTS ' if if_exists else ''
+    return [f"DROP TRIGGER {if_exists}{name}" for name in names]
+
+
+def reservation_overlap_triggers_sql():
+    """ Triggers rejecting a confirmed reservation that overlaps another confirmed one of its property. """
+    return [
+        f"CREATE TRIGGER manager_reservation_no_overlap_{event.lower()} "
+        f"BEFORE {event} ON manager_reservation "
+        "WHEN NEW.status = 'Confirmed' AND EXISTS ("
+        f"SELECT 1 FROM manager_reservation WHERE property_id = NEW.property_id {other_rows}"
+        "AND status = 'Confirmed' AND start_date < NEW.end_date AND end_date > NEW.start_date) "
+        "BEGIN SELECT RAISE(ABORT, 'manager_reservation_no_overlap'); END"
+        for event, other_rows in (('INSERT', ''), ('UPDATE', 'AND id <> NEW.id '))
+    ]
+
+
+def drop_reservation_overlap_triggers_sql(if_exists=False):
+    return drop_triggers_sql(
+        ['manager_reservation_no_overlap_update', 'manager_reservation_no_overlap_insert'], if_exists
+    )
+
+
+def search_triggers_sql(table):
+    """ Triggers keeping the FTS5 search table of a table in sync with its rows. """
+    search_table = f'{table}_search'
+    columns = SEARCH_COLUMNS[table]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'NEW.{column}' for column in columns)
+    old_values = ', '.join(f'OLD.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {search_table}({search_table}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {search_table}(rowid, {column_list}) VALUES (NEW.id, {new_values});"
+    return [
+        f"CREATE TRIGGER {search_table}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {search_table}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {search_table}_update AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def drop_search_triggers_sql(table, if_exists=False):
+    search_table = f'{table}_search'
+    return drop_triggers_sql(
+        [f'{search_table}_update', f'{search_table}_delete', f'{search_table}_insert'], if_exists
+    )
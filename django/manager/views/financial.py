@@ -1,41 +1,47 @@
 # Django imports
-from django.db.models import Sum, Count
 from django.utils.translation import gettext_lazy as _
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 # Third party imports
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 
 # Project imports
-from manager.models import Property, SeazoneCommission, HostCommission, OwnerCommission
+from manager.rollups import month_bounds
+from manager.statements import (
+    abuild_commission_statement,
+    build_commission_statement,
+    commission_statement_rows,
+)
+from shared.http.streaming import EXPORT_FORMATS, streaming_export_response
+from shared.views import AsyncViewSetMixin
 
 
-class CommissionViewSet(viewsets.ViewSet):
-    """ A ViewSet for Financial. """
+COMMISSION_PARAMETERS = [
+    openapi.Parameter(
+        'type', openapi.IN_QUERY, description="Type 'seazone', 'owner', 'host", type=openapi.TYPE_STRING,
+        required=True
+    ),
+    openapi.Parameter(
+        'month', openapi.IN_QUERY, description="Month MM",
+        type=openapi.TYPE_STRING, required=False
+    ),
+    openapi.Parameter(
+        'year', openapi.IN_QUERY, description="Month YYYYY",
+        type=openapi.TYPE_STRING, required=False
+    ),
+]
 
 
-    @swagger_auto_schema(
-        operation_summary="Financial commission",
-        manual_parameters=[
-            openapi.Parameter(
-                'type', openapi.IN_QUERY, description="Type 'seazone', 'owner', 'host", type=openapi.TYPE_STRING,
-                required=True
-            ),
-            openapi.Parameter(
-                'month', openapi.IN_QUERY, description="Month MM",
-                type=openapi.TYPE_STRING, required=False
-            ),
-            openapi.Parameter(
-                'year', openapi.IN_QUERY, description="Month YYYYY",
-                type=openapi.TYPE_STRING, required=False
-            ),
-        ]
-    )
-    def list(self, request, *args, **kwargs):
+class CommissionViewSet(AsyncViewSetMixin, viewsets.ViewSet):
+    """ A ViewSet for Financial. """
+
+    @staticmethod
+    def get_statement_params(request):
         commission_type = request.query_params.get('type', None)
         month = request.query_params.get('month', None)
         year = request.query_params.get('year', None)
@@ -48,42 +54,57 @@ class CommissionViewSet(viewsets.ViewSet):
                 _("Required year and month.")
             )
 
-        filter = {}
         if month and year:
-            filter = {
-                'reservation_date__year': year,
-                'reservation_date__month': month
-            }
-
-        if commission_type == 'seazone':
-            commissions = SeazoneCommission.objects.filter(**filter)
-        elif commission_type == 'host':
-            commissions = HostCommission.objects.filter(**filter)
-        elif commission_type == 'owner':
-            commissions = OwnerCommission.objects.filter(**filter)
-
-        total_commission = commissions.aggregate(total_commission=Sum('commission_value'))['total_commission'] or 0
-        total_reservations = commissions.aggregate(total_reservations=Count('id'))['total_reservations'] or 0
-
-        properties_statement = []
-        for property in Property.objects.all():
-            property_commissions = commissions.filter(reservation__property=property)
-            total_property_commission = property_commissions.aggregate(
-                total_commission=Sum('commission_value')
-            )['total_commission'] or 0
-            total_property_reservations = property_commissions.aggregate(
-                total_reservations=Count('id')
-            )['total_reservations'] or 0
-            properties_statement.append({
-                'property_id': property.id,
-                'total_commission': total_property_commission,
-                'total_reservations': total_property_reservations
-            })
-
-        data = {
-            'total_commission': total_commission,
-            'total_reservations': total_reservations,
-            'properties_statement': properties_statement
-        }
+            try:
+                year, month = int(year), int(month)
+            except ValueError:
+                raise ValidationError(_("Year and month must be numbers."))
+            try:
+                month_bounds(year, month)
+            except ValueError:
+                raise ValidationError(_("Invalid year and month."))
+
+        return commission_type, year, month
+
+    @swagger_auto_schema(
+        operation_summary="Financial commission",
+        manual_parameters=COMMISSION_PARAMETERS
+    )
+    def list(self, request, *args, **kwargs):
+        commission_type, year, month = self.get_statement_params(request)
+
+        data = build_commission_statement(commission_type, year=year, month=month)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    async def alist(self, request, *args, **kwargs):
+        commission_type, year, month = self.get_statement_params(request)
+
+        data = await abuild_commission_statement(commission_type, year=year, month=month)
 
         return Response(data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Export financial commission statement",
+        manual_parameters=COMMISSION_PARAMETERS + [
+            openapi.Parameter(
+                'export_format', openapi.IN_QUERY, description="'csv' or 'ndjson', default 'csv'",
+                type=openapi.TYPE_STRING, required=False
+            ),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        commission_type, year, month = self.get_statement_params(request)
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(_("Use export_format 'csv' or 'ndjson'."))
+
+        rows = commission_statement_rows(commission_type, year=year, month=month)
+        return streaming_export_response(
+            request,
+            ('property_id', 'total_commission', 'total_reservations'),
+            rows,
+            export_format,
+            f'{commission_type}_commissions'
+        )
@@ -14,6 +14,8 @@ class HostViewSet(BaseCollectionViewSet):
     serializer_class = HostSerializer
     http_method_names = ('get', 'post')
     search_fields = ('name',)
+    indexed_search = True
+    response_cache_models = (model_class,)
     serializers = {
         'default': serializer_class,
     }
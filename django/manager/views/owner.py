@@ -14,6 +14,8 @@ class OwnerViewSet(BaseCollectionViewSet):
     serializer_class = OwnerSerializer
     http_method_names = ('get', 'post')
     search_fields = ('name',)
+    indexed_search = True
+    response_cache_models = (model_class,)
     serializers = {
         'default': serializer_class,
     }
@@ -1,4 +1,11 @@
+# Base imports
+from datetime import timedelta
+
 # Django imports
+from django.db.models import Exists, OuterRef
+from django.http.response import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.utils.translation import gettext_lazy as _
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
@@ -6,16 +13,28 @@ from drf_yasg import openapi
 # Third party imports
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 # Project imports
 from manager.filters import PropertyFilter
-from manager.models import Property, Reservation
-from manager.serializers import PropertySerializer, PropertyCreateSerializer
+from manager.models import Host, Owner, Property, Reservation
+from manager.occupancy import OCCUPANCY_EPOCH, get_property_occupancy
+from manager.quotes import quote_stays
+from manager.serializers import (
+    PropertySerializer,
+    PropertyCreateSerializer,
+    PropertyAvailabilitySearchSerializer,
+    PropertyQuoteSerializer,
+)
+from shared.http.responses import not_found_response
 from shared.views import BaseCollectionViewSet
 
 
+CALENDAR_MAX_NIGHTS = 731
+
+
 class PropertyViewSet(BaseCollectionViewSet):
     """ A ViewSet for Property. """
     model_class = Property
@@ -23,11 +42,16 @@ class PropertyViewSet(BaseCollectionViewSet):
     serializer_class = PropertySerializer
     http_method_names = ('get', 'post')
     search_fields = ('title',)
+    indexed_search = True
+    last_modified_lookups = ('updated_at', 'host__updated_at', 'owner__updated_at')
+    response_cache_models = (model_class, Host, Owner)
     serializers = {
         'default': serializer_class,
         'create': PropertyCreateSerializer,
     }
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('title', 'id')
+    values_list_enabled = True
     filterset_class = PropertyFilter
 
     @swagger_auto_schema(
@@ -53,27 +77,49 @@ class PropertyViewSet(BaseCollectionViewSet):
     )
     @action(detail=False, methods=['get'])
     def availability(self, request):
-        property_id = request.GET.get('property_id')
-        start_date = request.GET.get('start_date')
-        end_date = request.GET.get('end_date')
-        guests_quantity = request.GET.get('guests_quantity')
+        try:
+            property_obj = Property.objects.get(id=request.GET.get('property_id'))
+        except Property.DoesNotExist:
+            property_obj = None
+
+        response = self.get_availability_error_response(request, property_obj)
+        if response is not None:
+            return response
+        return self.get_availability_response(self.get_overlapping_reservations(request, property_obj).exists())
 
+    async def aavailability(self, request):
         try:
-            property_obj = Property.objects.get(id=property_id)
+            property_obj = await Property.objects.aget(id=request.GET.get('property_id'))
         except Property.DoesNotExist:
+            property_obj = None
+
+        response = self.get_availability_error_response(request, property_obj)
+        if response is not None:
+            return response
+        return self.get_availability_response(
+            await self.get_overlapping_reservations(request, property_obj).aexists()
+        )
+
+    @staticmethod
+    def get_availability_error_response(request, property_obj):
+        if property_obj is None:
             return Response(status=status.HTTP_404_NOT_FOUND, data={'message': _('Property not found')})
 
-        if property_obj.capacity < int(guests_quantity):
+        if property_obj.capacity < int(request.GET.get('guests_quantity')):
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
                 data={'message': _('Property does not have capacity')}
             )
+        return None
+
+    @staticmethod
+    def get_overlapping_reservations(request, property_obj):
+        return Reservation.objects.filter(
+            property=property_obj
+        ).overlapping(request.GET.get('start_date'), request.GET.get('end_date'))
 
-        overlapping_reservations = Reservation.objects.filter(
-            property=property_obj,
-            start_date__lt=end_date,
-            end_date__gt=start_date
-        ).exists()
+    @staticmethod
+    def get_availability_response(overlapping_reservations):
         if overlapping_reservations:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
@@ -83,4 +129,123 @@ class PropertyViewSet(BaseCollectionViewSet):
         return Response(
             status=status.HTTP_200_OK,
             data={'message': _('Avalailable for the selected dates.')}
-        )
\ No newline at end of file
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Availability of many properties",
+        operation_description="Accepts the same filters as the property list in the query string.",
+        request_body=PropertyAvailabilitySearchSerializer
+    )
+    @action(detail=False, methods=['post'], url_path='availability/search')
+    def availability_search(self, request):
+        serializer = PropertyAvailabilitySearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        property_ids = serializer.validated_data.get('property_ids')
+        date_ranges = serializer.validated_data['date_ranges']
+        guests_quantity = serializer.validated_data['guests_quantity']
+
+        properties = self.filter_queryset(self.get_queryset()).filter(capacity__gte=guests_quantity)
+        if property_ids:
+            properties = properties.filter(id__in=property_ids)
+
+        # One query for every range: an EXISTS column per range tells whether it is occupied.
+        occupied = {
+            f'occupied_{index}': Exists(
+                Reservation.objects.filter(property=OuterRef('pk')).overlapping(
+                    date_range['start_date'], date_range['end_date']
+                )
+            )
+            for index, date_range in enumerate(date_ranges)
+        }
+        results = [
+            {'start_date': date_range['start_date'], 'end_date': date_range['end_date'], 'property_ids': []}
+            for date_range in date_ranges
+        ]
+        for property_id, *occupied_ranges in properties.annotate(**occupied).order_by('id').values_list(
+            'id', *occupied
+        ):
+            for result, range_occupied in zip(results, occupied_ranges):
+                if not range_occupied:
+                    result['property_ids'].append(property_id)
+
+        return Response(
+            status=status.HTTP_200_OK,
+            data={'results': results}
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Price quotes of many stays",
+        operation_description=(
+            "Total price and seazone, host and owner commissions of each stay, in the order sent, "
+            "computed like a new reservation. Stays of a missing property or above its capacity "
+            "get 'errors' instead. Availability is not checked."
+        ),
+        request_body=PropertyQuoteSerializer
+    )
+    @action(detail=False, methods=['post'])
+    def quote(self, request):
+        serializer = PropertyQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            status=status.HTTP_200_OK,
+            data={'results': quote_stays(serializer.validated_data['stays'])}
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Occupancy calendar of a property",
+        operation_description=(
+            "The occupancy has one character per night from 'from' (inclusive) to 'to' (exclusive), "
+            "'1' when the night is booked and '0' when it is free."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                'from', openapi.IN_QUERY, description="First night (format YYYY-MM-DD), default today",
+                type=openapi.TYPE_STRING, required=False
+            ),
+            openapi.Parameter(
+                'to', openapi.IN_QUERY, description="Night after the last one (format YYYY-MM-DD), default one year",
+                type=openapi.TYPE_STRING, required=False
+            ),
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    def calendar(self, request, pk=None):
+        try:
+            property_obj = self.get_object()
+        except Http404 as exception:
+            return not_found_response(exception)
+
+        start_date = request.GET.get('from')
+        end_date = request.GET.get('to')
+        try:
+            start_date = parse_date(start_date) if start_date else timezone.now().date()
+            end_date = parse_date(end_date) if end_date else start_date + timedelta(days=365)
+        except (TypeError, ValueError):
+            start_date = end_date = None
+        if not start_date or not end_date:
+            raise ValidationError(_("Use dates in the format YYYY-MM-DD."))
+        if start_date < OCCUPANCY_EPOCH:
+            raise ValidationError(
+                _("The calendar cannot start before %(date)s.") % {'date': OCCUPANCY_EPOCH.isoformat()}
+            )
+
+        nights = (end_date - start_date).days
+        if nights <= 0 or nights > CALENDAR_MAX_NIGHTS:
+            raise ValidationError(
+                _("The calendar must cover between 1 and %(nights)s nights.") % {'nights': CALENDAR_MAX_NIGHTS}
+            )
+
+        occupancy = get_property_occupancy(property_obj.pk)
+        occupied_nights = occupancy.occupied_nights(start_date, end_date)
+        return Response(
+            status=status.HTTP_200_OK,
+            data={
+                'property_id': property_obj.pk,
+                'from': start_date,
+                'to': end_date,
+                'nights': nights,
+                'occupied_nights': occupied_nights,
+                'free_nights': nights - occupied_nights,
+                'occupancy': occupancy.days(start_date, end_date),
+            }
+        )
@@ -1,23 +1,182 @@
+# Base imports
+import codecs
+
+# Django imports
+from django.db import transaction
+from django.http.response import Http404
+from django.utils.translation import gettext_lazy as _
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
 # Third party imports
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 # Project imports
 from manager.filters import ReservationFilter
-from manager.models import Reservation
+from manager.importers import ReservationImporter, read_import_rows
+from manager.models import Reservation, StatusChoices
 from manager.serializers import ReservationSerializer, ReservationCreateSerializer
+from shared.http.responses import not_found_response
+from shared.http.streaming import EXPORT_FORMATS, streaming_export_response
 from shared.views import BaseCollectionViewSet
 
 
+EXPORT_FIELDS = (
+    'id',
+    'property_id',
+    'property__title',
+    'property__owner_id',
+    'property__host_id',
+    'client_name',
+    'client_email',
+    'start_date',
+    'end_date',
+    'guests_quantity',
+    'total_price',
+    'status',
+    'seazone_commission__commission_value',
+    'host_commission__commission_value',
+    'owner_commission__commission_value',
+)
+EXPORT_HEADER = (
+    'id',
+    'property_id',
+    'property_title',
+    'owner_id',
+    'host_id',
+    'client_name',
+    'client_email',
+    'start_date',
+    'end_date',
+    'guests_quantity',
+    'total_price',
+    'status',
+    'seazone_commission',
+    'host_commission',
+    'owner_commission',
+)
+
+
 class ReservationViewSet(BaseCollectionViewSet):
     """ A ViewSet for Reservation. """
     model_class = Reservation
-    queryset = model_class.objects.all()
+    queryset = model_class.objects.select_related(
+        'property__owner',
+        'property__host',
+        'seazone_commission',
+        'host_commission',
+        'owner_commission',
+    )
     serializer_class = ReservationSerializer
     http_method_names = ('get', 'post')
     search_fields = ('client_name', 'client_email')
+    indexed_search = True
+    last_modified_lookups = (
+        'updated_at',
+        'property__updated_at',
+        'property__host__updated_at',
+        'property__owner__updated_at',
+        'seazone_commission__updated_at',
+        'host_commission__updated_at',
+        'owner_commission__updated_at',
+    )
     serializers = {
         'default': serializer_class,
         'create': ReservationCreateSerializer,
     }
     permission_classes = [IsAuthenticated]
-    filterset_class = ReservationFilter
\ No newline at end of file
+    keyset_ordering = ('id',)
+    values_list_enabled = True
+    filterset_class = ReservationFilter
+
+    import_content_types = {
+        'text/csv': 'csv',
+        'application/x-ndjson': 'ndjson',
+        'application/jsonl': 'ndjson',
+    }
+
+    @swagger_auto_schema(
+        operation_summary="Import reservations",
+        operation_description=(
+            "Send a CSV file with header or a NDJSON file as the request body, with the content type "
+            "text/csv or application/x-ndjson. Rows are property, client_name, client_email, start_date, "
+            "end_date, guests_quantity and optionally status. Invalid rows are reported and skipped. "
+            "To resume an interrupted import send start_row with the last_row of the previous answer."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                'start_row', openapi.IN_QUERY, description="Skip the rows up to this one",
+                type=openapi.TYPE_INTEGER, required=False
+            ),
+        ]
+    )
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_reservations(self, request):
+        import_format = self.import_content_types.get(request.content_type.split(';')[0].strip())
+        if not import_format:
+            raise UnsupportedMediaType(request.content_type)
+
+        try:
+            start_row = int(request.query_params.get('start_row', 0))
+        except ValueError:
+            raise ValidationError(_("start_row must be a number."))
+
+        stream = request.stream
+        lines = codecs.iterdecode(iter(stream.readline, b''), 'utf-8') if stream else []
+        result = ReservationImporter().run(read_import_rows(lines, import_format), start_row=start_row)
+        return Response(status=status.HTTP_200_OK, data=result)
+
+    @swagger_auto_schema(
+        operation_summary="Export reservations with their commissions",
+        operation_description="Accepts the same filters and search as the reservation list.",
+        manual_parameters=[
+            openapi.Parameter(
+                'export_format', openapi.IN_QUERY, description="'csv' or 'ndjson', default 'csv'",
+                type=openapi.TYPE_STRING, required=False
+            ),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(_("Use export_format 'csv' or 'ndjson'."))
+
+        rows = self.filter_queryset(self.get_queryset()).order_by('id').values_list(*EXPORT_FIELDS)
+        return streaming_export_response(
+            request,
+            EXPORT_HEADER,
+            rows,
+            export_format,
+            'reservations'
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Cancel a reservation",
+        operation_description=(
+            "Cancels a confirmed reservation and frees its dates. Its commissions are zeroed and taken "
+            "out of the financial statements in the same transaction."
+        ),
+        request_body=None
+    )
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        try:
+            reservation = self.get_object()
+        except Http404 as exception:
+            return not_found_response(exception)
+
+        with transaction.atomic():
+            # Locked so concurrent cancellations take the commissions out of the rollups once.
+            reservation = Reservation.objects.select_for_update().get(pk=reservation.pk)
+            if reservation.status == StatusChoices.CANCELLED:
+                raise ValidationError(_("The reservation is already cancelled."))
+            reservation.status = StatusChoices.CANCELLED
+            reservation.save(update_fields=['status', 'updated_at'])
+
+        serializer = self.get_serializer(self.get_queryset().get(pk=reservation.pk))
+        return Response(status=status.HTTP_200_OK, data=serializer.data)
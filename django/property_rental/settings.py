@@ -1,8 +1,10 @@
 import os
 import sys
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
+from shared.pooling import connection_reuse_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,13 +45,30 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_APPS + INTERNAL_APPS
 
 AUTH_USER_MODEL = 'authentication.User'
 
+# 'orjson' renders and parses JSON with orjson (same output as DRF's classes), 'stdlib' with the
+# json module. Views can still choose their own renderer_classes and parser_classes.
+JSON_BACKEND = config('JSON_BACKEND', default='orjson')
+JSON_RENDERER_CLASS, JSON_PARSER_CLASS = {
+    'orjson': ('shared.renderers.ORJSONRenderer', 'shared.parsers.ORJSONParser'),
+    'stdlib': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
+}[JSON_BACKEND]
+
 REST_FRAMEWORK = {
     'NON_FIELD_ERRORS_KEY': 'errors',
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        JSON_RENDERER_CLASS,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        JSON_PARSER_CLASS,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -70,6 +89,7 @@ SWAGGER_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    'shared.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +102,13 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'property_rental.urls'
 
+# Serves the viewset actions with an async twin (a<action>) through Django's async request path.
+# Only for ASGI servers, see scripts/run_asgi_server.sh; WSGI servers keep the sync actions.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+# Clients allowed to read /metrics/, e.g. the Prometheus server.
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=Csv())
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -122,6 +149,49 @@ else:
     }
 
 
+# Connection reuse: 'persistent' for uwsgi, 'pool' for ASGI (scripts/run_asgi_server.sh sets it)
+# or 'none', see shared.pooling.connection_reuse_settings.
+DB_POOL_MODE = config('DB_POOL_MODE', default='persistent')
+DATABASES['default'].update(connection_reuse_settings(
+    DB_POOL_MODE,
+    DATABASES['default']['ENGINE'],
+    conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+    pool={
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        # Seconds a request waits for a connection before failing.
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        # Seconds before idle connections above min_size are closed.
+        'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+        'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+    },
+))
+
+# RESPONSE_CACHE_BACKEND and RESPONSE_CACHE_LOCATION point the response cache to a cache shared
+# by every process (e.g. Redis with an allkeys-lru policy). A cache local to each process would
+# keep serving what the other processes invalidated, so it is only the default under DEBUG,
+# in development and in the tests.
+RESPONSE_CACHE_BACKEND = config('RESPONSE_CACHE_BACKEND', default=None)
+if RESPONSE_CACHE_BACKEND is None:
+    if not (DEBUG or ENVIRONMENT_MODE in ('dev', 'unit') or 'test' in sys.argv or 'test_coverage' in sys.argv):
+        raise ImproperlyConfigured('Set RESPONSE_CACHE_BACKEND to a cache shared by every process.')
+    RESPONSE_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': RESPONSE_CACHE_BACKEND,
+        'LOCATION': config('RESPONSE_CACHE_LOCATION', default='responses'),
+        'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int),
+    },
+}
+if RESPONSE_CACHE_BACKEND.endswith('LocMemCache'):
+    # LocMemCache evicts the least recently used entries once full.
+    CACHES['responses']['OPTIONS'] = {
+        'MAX_ENTRIES': config('RESPONSE_CACHE_MAX_ENTRIES', default=10000, cast=int),
+        'CULL_FREQUENCY': 10,
+    }
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -163,6 +233,12 @@ LOCALE_PATHS = [
 
 if 'test' in sys.argv or 'test_coverage' in sys.argv:  # Covers regular testing and django-coverage
     DATABASES['default']['ENGINE'] = 'django.db.backends.sqlite3'
+    DATABASES['default'].pop('OPTIONS', None)
     ENVIRONMENT_MODE = 'unit'
     DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
     LANGUAGE_CODE = 'en-US'
+    # Random values of the money and basis point fields for model_bakery.
+    BAKER_CUSTOM_FIELDS_GEN = {
+        'shared.money.MoneyField': 'model_bakery.random_gen.gen_decimal',
+        'shared.money.BasisPointsField': 'shared.money.gen_basis_points',
+    }
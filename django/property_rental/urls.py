@@ -4,6 +4,7 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 
 from property_rental.admin import property_rental_admin
+from shared.views import DatabaseConnectionStatsView, ResponseCacheStatsView, metrics_view
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -23,6 +24,9 @@ urlpatterns = [
     path('v1/auth/', include('authentication.urls')),
     path('v1/auth/', include('djoser.urls.jwt')),
     path('v1/', include('manager.urls')),
+    path('v1/cache/stats/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
+    path('v1/database/stats/', DatabaseConnectionStatsView.as_view(), name='database-connection-stats'),
+    path('metrics/', metrics_view, name='metrics'),
     path('swagger<format>.json|.yaml/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
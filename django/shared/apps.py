@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class SharedConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shared'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from shared.db import count_connection_opened
+        from shared.metrics import instrument_connection
+
+        connection_created.connect(count_connection_opened)
+        connection_created.connect(instrument_connection)
@@ -0,0 +1,112 @@
+# Base imports
+import hashlib
+import json
+import threading
+import time
+
+# Django imports
+from django.core.cache import caches
+from django.db import router, transaction
+
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_VERSION_KEY = 'response_cache:version:{label}'
+
+
+class ResponseCacheStats:
+    """ Hits and misses of the response cache in this process. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_response_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def model_version_key(model):
+    return RESPONSE_CACHE_VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def get_model_versions(models):
+    """
+    Current version counter of each model. A counter missing from the cache, never set or
+    evicted, starts from the current time so it never repeats a version still cached.
+    """
+    cache = get_response_cache()
+    keys = [model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns())
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_model_versions(models):
+    """ get_model_versions through the async cache methods. """
+    cache = get_response_cache()
+    keys = [model_version_key(model) for model in models]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns())
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    cache = get_response_cache()
+    key = model_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns())
+
+
+def bump_response_cache_version(sender, **kwargs):
+    """
+    post_save and post_delete receiver invalidating the cached responses built from the sender.
+    Inside a transaction the version is bumped again on commit, so a response cached from the
+    data read before the commit is not served afterwards.
+    """
+    bump_model_version(sender)
+    using = router.db_for_write(sender)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: bump_model_version(sender), using=using)
+
+
+def response_cache_key(view, request, versions):
+    """
+    Key of a response from the view class, its action and arguments, the scope of the user,
+    the model versions, and the query parameters in a normalized order.
+    """
+    params = sorted((key, request.query_params.getlist(key)) for key in request.query_params)
+    digest = hashlib.sha1(
+        json.dumps([request.get_host(), view.kwargs, params], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return ':'.join([
+        'response',
+        type(view).__name__,
+        view.action,
+        str(view.get_response_cache_scope()),
+        '.'.join(str(version) for version in versions),
+        digest,
+    ])
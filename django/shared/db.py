@@ -0,0 +1,68 @@
+# Base imports
+import os
+import threading
+from collections import Counter
+
+# Django imports
+from django.contrib.postgres.fields import DateRangeField
+from django.db import connections, migrations
+from django.db.models import Func
+
+
+class DateRange(Func):
+    """ PostgreSQL DATERANGE(lower, upper, bounds) constructor. """
+    function = 'DATERANGE'
+    output_field = DateRangeField()
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """
+    RunSQL operation executed only on the given database vendor, for the indexes, constraints
+    and triggers that have no portable equivalent.
+    """
+
+    def __init__(self, vendor, *args, **kwargs):
+        self.vendor = vendor
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, [self.vendor, *args], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+_connections_opened = Counter()
+_connections_opened_lock = threading.Lock()
+
+
+def count_connection_opened(sender, connection, **kwargs):
+    """ connection_created receiver counting the connections opened by this process. """
+    with _connections_opened_lock:
+        _connections_opened[connection.alias] += 1
+
+
+def database_connection_stats():
+    """
+    Connection reuse of this worker process per database: the persistent connection settings,
+    the connections it opened and, with pooling, the psycopg pool statistics (size, available
+    connections, requests waiting, requests_wait_ms, timeouts as requests_errors).
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, 'pool', None)
+        stats[alias] = {
+            'vendor': connection.vendor,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'connections_opened': _connections_opened[alias],
+            'pool': pool.get_stats() if pool is not None else None,
+        }
+    return {'pid': os.getpid(), 'databases': stats}
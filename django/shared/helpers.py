@@ -3,9 +3,25 @@ try:
     from typing import TypedDict
 except ImportError:
     from typing_extensions import TypedDict
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from functools import partial
+import json
 import math
-from rest_framework.pagination import PageNumberPagination
+
+# Django imports
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+# Third party imports
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 sign = partial(math.copysign, 1)
@@ -14,9 +30,163 @@ sign = partial(math.copysign, 1)
 class DefaultPaginationClass(PageNumberPagination):
     page_size_query_param = "page_size"
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """ paginate_queryset with the count and the page rows read by the async ORM. """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exception:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exception)))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        return self.page.object_list
+
 
 class MyCustomPagination(PageNumberPagination):
     page = 1
     page_size = 1000
     page_query_param = 'page'
     page_size_query_param = 'page_size'
+
+
+class KeysetPaginationClass(BasePagination):
+    """
+    Cursor pagination over a stable ordering ending in a unique field, e.g. ('title', 'id').
+
+    Each page continues after the ordering values of the previous page's last row, so deep
+    pages cost the same as the first one. The count is skipped unless asked with
+    count=exact or count=estimate (planner estimate on PostgreSQL).
+    """
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.count = None
+        self.next_position = None
+
+    @staticmethod
+    def encode_cursor(position):
+        return urlsafe_b64encode(json.dumps(position, cls=DjangoJSONEncoder).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            return json.loads(urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError) as exception:
+            raise NotFound(_('Invalid cursor.')) from exception
+
+    def clean_position(self, model, position):
+        """
+        Cursor position converted by the fields of the ordering, a well-formed cursor holding
+        values of other types is as invalid as a malformed one.
+        """
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(_('Invalid cursor.'))
+        try:
+            values = []
+            for field_path, value in zip(self.ordering, position):
+                if value is None:
+                    raise ValueError('Null cursor value.')
+                field_model = model
+                *relations, field_name = field_path.lstrip('-').split('__')
+                for relation in relations:
+                    field_model = field_model._meta.get_field(relation).related_model
+                values.append(field_model._meta.get_field(field_name).to_python(value))
+        except (DjangoValidationError, TypeError, ValueError) as exception:
+            raise NotFound(_('Invalid cursor.')) from exception
+        return values
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_position_filter(self, position):
+        position_filter = Q()
+        for index, field in enumerate(self.ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{f'{field.lstrip("-")}__{lookup}': position[index]})
+            for previous_field, previous_value in zip(self.ordering[:index], position[:index]):
+                condition &= Q(**{previous_field.lstrip('-'): previous_value})
+            position_filter |= condition
+        return position_filter
+
+    def get_row_position(self, row):
+        if isinstance(row, dict):
+            return [row[field.lstrip('-')] for field in self.ordering]
+        return [getattr(row, field.lstrip('-')) for field in self.ordering]
+
+    @staticmethod
+    def estimate_count(queryset):
+        if connections[queryset.db].vendor != 'postgresql':
+            return queryset.count()
+        plan = json.loads(queryset.explain(format='json'))
+        return plan[0]['Plan']['Plan Rows']
+
+    def get_page_queryset(self, queryset, request):
+        """ The rows after the cursor position, one more than the page size to detect a next page. """
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            position = self.clean_position(queryset.model, self.decode_cursor(cursor))
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[:self.get_page_size(request) + 1]
+
+    def get_page_rows(self, rows, request):
+        page_size = self.get_page_size(request)
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = self.get_row_position(rows[-1])
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            self.count = queryset.count()
+        elif count_mode == 'estimate':
+            self.count = self.estimate_count(queryset)
+
+        return self.get_page_rows(list(self.get_page_queryset(queryset, request)), request)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            self.count = await queryset.acount()
+        elif count_mode == 'estimate':
+            self.count = await sync_to_async(self.estimate_count)(queryset)
+
+        return self.get_page_rows([row async for row in self.get_page_queryset(queryset, request)], request)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        # The count is only computed for the first page asking for it.
+        return replace_query_param(
+            remove_query_param(self.request.build_absolute_uri(), self.count_query_param),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link(), 'results': data}
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
@@ -0,0 +1,88 @@
+# Base imports
+import csv
+from itertools import islice
+from typing import AsyncIterable, Iterable, Sequence
+
+# Django imports
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+
+# Third party imports
+from asgiref.sync import sync_to_async
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _EchoBuffer:
+    """ File-like object handing back what csv.writer writes, so each row is streamed. """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence]) -> Iterable[str]:
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(header: Sequence[str], rows: Iterable[Sequence]) -> Iterable[str]:
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + '\n'
+
+
+async def aiterate_chunks(rows: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterable[list]:
+    """
+    Rows of the queryset read chunk by chunk in a thread. QuerySet.aiterator() runs the query of
+    values_list() querysets in the event loop, which Django refuses.
+    """
+    iterator = rows.iterator(chunk_size=chunk_size)
+    while chunk := await sync_to_async(lambda: list(islice(iterator, chunk_size)))():
+        yield chunk
+
+
+# Each chunk of rows is sent at once, a message per row costs more than writing it.
+async def astream_csv(header: Sequence[str], chunks: AsyncIterable[list]) -> AsyncIterable[str]:
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(header)
+    async for chunk in chunks:
+        yield ''.join(map(writer.writerow, chunk))
+
+
+async def astream_ndjson(header: Sequence[str], chunks: AsyncIterable[list]) -> AsyncIterable[str]:
+    encoder = DjangoJSONEncoder()
+    async for chunk in chunks:
+        yield ''.join(encoder.encode(dict(zip(header, row))) + '\n' for row in chunk)
+
+
+def streaming_export_response(
+    request,
+    header: Sequence[str],
+    rows: QuerySet,
+    export_format: str,
+    filename: str
+) -> StreamingHttpResponse:
+    """
+    Generates a CSV or NDJSON download that is written while the rows are read.
+
+    Under ASGI the rows are read with an async iterator: Django reads a sync iterator whole
+    before sending the first byte of an ASGI response.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        stream = astream_csv if export_format == 'csv' else astream_ndjson
+        content = stream(header, aiterate_chunks(rows))
+    else:
+        stream = stream_csv if export_format == 'csv' else stream_ndjson
+        content = stream(header, rows.iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,185 @@
+# Base imports
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Project imports
+from shared.cache import response_cache_stats
+from shared.db import database_connection_stats
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+
+class Histogram:
+    """ Prometheus histogram of this process, one series per label values tuple. """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def expose(self, extra_labels):
+        with self._lock:
+            series = [(label_values, list(counts), total) for label_values, (counts, total) in self._series.items()]
+
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for label_values, counts, total in sorted(series):
+            labels = format_labels(dict(zip(self.label_names, label_values), **extra_labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                bucket_labels = format_labels({'le': bound}, labels)
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+def format_labels(labels, prefix=None):
+    """ Label list of a sample, with the values escaped. """
+    formatted = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"'))
+        for name, value in labels.items()
+    )
+    if prefix is None:
+        return formatted
+    return '{' + ','.join(filter(None, (prefix, formatted))) + '}'
+
+
+REQUEST_LABELS = ('view', 'method')
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Time to respond to a request.', (*REQUEST_LABELS, 'status'), LATENCY_BUCKETS
+)
+request_queries = Histogram(
+    'http_request_db_queries', 'SQL queries run by a request.', REQUEST_LABELS, QUERY_COUNT_BUCKETS
+)
+request_db_duration = Histogram(
+    'http_request_db_duration_seconds', 'Time spent running the SQL queries of a request.', REQUEST_LABELS,
+    LATENCY_BUCKETS
+)
+request_serializer_duration = Histogram(
+    'http_request_serializer_duration_seconds',
+    'Time spent serializing and rendering the response data, without the queries run meanwhile.',
+    REQUEST_LABELS, LATENCY_BUCKETS
+)
+response_size = Histogram(
+    'http_response_size_bytes', 'Size of the response bodies, streaming responses excluded.', REQUEST_LABELS,
+    SIZE_BUCKETS
+)
+REQUEST_HISTOGRAMS = (request_duration, request_queries, request_db_duration, request_serializer_duration, response_size)
+
+
+class RequestMetrics:
+    """ Measurements of the request being served, shared with its threads through a context variable. """
+    __slots__ = ('queries', 'db_seconds', 'serializer_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+    def observe(self, view, method, status_code, seconds, size):
+        request_duration.observe((view, method, str(status_code)), seconds)
+        request_queries.observe((view, method), self.queries)
+        request_db_duration.observe((view, method), self.db_seconds)
+        request_serializer_duration.observe((view, method), self.serializer_seconds)
+        if size is not None:
+            response_size.observe((view, method), size)
+
+
+current_request_metrics = ContextVar('current_request_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """ Database execute wrapper counting and timing the queries of the current request. """
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - start
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """ connection_created receiver adding record_query to the connection. """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializing():
+    """ Adds the time spent in the block, minus the queries run meanwhile, to the serializer time. """
+    metrics = current_request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start, db_seconds = time.perf_counter(), metrics.db_seconds
+    try:
+        yield
+    finally:
+        metrics.serializer_seconds += time.perf_counter() - start - (metrics.db_seconds - db_seconds)
+
+
+def render_metrics():
+    """
+    Metrics of this worker process in the Prometheus text format: the request histograms, the
+    response cache hits and misses and the database connection statistics. Every sample has the
+    worker pid label, so the series of the workers of a server stay apart.
+    """
+    worker = {'worker': os.getpid()}
+    worker_labels = format_labels(worker)
+    lines = []
+    for histogram in REQUEST_HISTOGRAMS:
+        lines += histogram.expose(worker)
+
+    cache_stats = response_cache_stats.snapshot()
+    for name in ('hits', 'misses'):
+        lines += [
+            f'# HELP response_cache_{name}_total Response cache {name}.',
+            f'# TYPE response_cache_{name}_total counter',
+            f'response_cache_{name}_total{{{worker_labels}}} {cache_stats[name]}',
+        ]
+
+    databases = database_connection_stats()['databases']
+    lines += [
+        '# HELP db_connections_opened_total Database connections opened.',
+        '# TYPE db_connections_opened_total counter',
+    ]
+    lines += [
+        f'db_connections_opened_total{{{format_labels(dict(worker, database=alias))}}} {stats["connections_opened"]}'
+        for alias, stats in databases.items()
+    ]
+    pool_stats = {}
+    for alias, stats in databases.items():
+        for name, value in (stats['pool'] or {}).items():
+            pool_stats.setdefault(name, []).append((alias, value))
+    for name, values in sorted(pool_stats.items()):
+        lines += [f'# HELP db_pool_{name} Connection pool {name}.', f'# TYPE db_pool_{name} gauge']
+        lines += [
+            f'db_pool_{name}{{{format_labels(dict(worker, database=alias))}}} {value}' for alias, value in values
+        ]
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,72 @@
+# Base imports
+import time
+
+# Django imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Project imports
+from shared.metrics import RequestMetrics, current_request_metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the latency, SQL queries, database time, serializer time and response size of every
+    request, labelled by view name and method. Works in both the sync and async request paths
+    without switching threads, it must come first in MIDDLEWARE to time the whole request.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        self.observe(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        self.observe(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    def process_template_response(self, request, response):
+        """ Times the rendering of the response (e.g. DRF responses), which runs after this hook. """
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return response
+        start, db_seconds = time.perf_counter(), metrics.db_seconds
+
+        def rendered(response):
+            metrics.serializer_seconds += time.perf_counter() - start - (metrics.db_seconds - db_seconds)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return self.process_template_response(request, response)
+
+    @staticmethod
+    def observe(request, response, metrics, seconds):
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = resolver_match.view_name if resolver_match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        metrics.observe(view, request.method, response.status_code, seconds, size)
@@ -0,0 +1,103 @@
+# Base imports
+import random
+from decimal import ROUND_HALF_EVEN, Decimal
+
+# Django imports
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# Basis points in a whole: a rate of 0.15 is 1500 basis points.
+BASIS_POINTS = 10000
+
+
+def to_minor_units(amount, decimal_places=2):
+    """ Integer minor units (cents) of a decimal amount, rounded half to even like Decimal.quantize. """
+    return int(Decimal(amount).scaleb(decimal_places).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_minor_units(units, decimal_places=2):
+    """ Decimal amount, with exactly decimal_places places, of a number of minor units. """
+    return Decimal(units).scaleb(-decimal_places)
+
+
+def to_basis_points(rate):
+    """ Integer basis points of a rate given as a fraction of one. """
+    return round(rate * BASIS_POINTS)
+
+
+def from_basis_points(basis_points):
+    return basis_points / BASIS_POINTS
+
+
+def apply_basis_points(units, basis_points):
+    """ Share of an amount in minor units, rounded half to even to a whole minor unit. """
+    share, remainder = divmod(units * basis_points, BASIS_POINTS)
+    if remainder * 2 > BASIS_POINTS or (remainder * 2 == BASIS_POINTS and share % 2):
+        share += 1
+    return share
+
+
+def validate_basis_points(rate):
+    if abs(rate * BASIS_POINTS - to_basis_points(rate)) > 1e-6:
+        raise ValidationError(_('Ensure that there are no more than 4 decimal places.'), code='basis_points')
+
+
+def gen_basis_points():
+    """ Random rate between 0 and 1 in whole basis points, the model_bakery generator of BasisPointsField. """
+    return from_basis_points(random.randint(0, BASIS_POINTS))
+
+
+class MoneyField(models.DecimalField):
+    """
+    Amount of money stored as an integer number of minor units (cents for 2 decimal places).
+
+    In Python it is still the Decimal of a DecimalField, with exactly decimal_places places,
+    so forms, filters, serializers and the API format are unchanged, while the database sums,
+    compares and indexes integers. Lookups, saves and aggregates convert the units.
+    """
+
+    def get_internal_type(self):
+        return 'BigIntegerField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return from_minor_units(value, self.decimal_places)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        if not prepared:
+            value = self.get_prep_value(value)
+        return to_minor_units(value, self.decimal_places)
+
+    def get_db_prep_save(self, value, connection):
+        return self.get_db_prep_value(value, connection)
+
+
+class BasisPointsField(models.FloatField):
+    """
+    Rate stored as an integer number of basis points, 0.15 is stored as 1500. In Python it
+    is still the float fraction of a FloatField.
+    """
+    default_validators = [validate_basis_points]
+
+    def get_internal_type(self):
+        return 'IntegerField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return from_basis_points(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        if not prepared:
+            value = self.get_prep_value(value)
+        return to_basis_points(value)
+
+    def get_db_prep_save(self, value, connection):
+        return self.get_db_prep_value(value, connection)
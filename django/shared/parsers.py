@@ -0,0 +1,46 @@
+# Base imports
+import codecs
+import re
+
+# Django imports
+from django.conf import settings
+
+# Third party imports
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+# Project imports
+from shared.renderers import ORJSONRenderer
+
+
+# orjson reads the integers over 64 bits as floats, the bodies with 20 digits in a row are left to json.
+LONG_DIGITS = re.compile(rb'\d{20}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser decoding with orjson. The bodies orjson rejects and the ones that may hold integers
+    over 64 bits are parsed by the json module, so the errors keep their messages.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not self.strict:
+            # orjson never accepts NaN and Infinity.
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read()
+            if codecs.lookup(encoding).name == 'utf-8' and not LONG_DIGITS.search(content):
+                try:
+                    return orjson.loads(content)
+                except orjson.JSONDecodeError:
+                    pass
+            return json.loads(content.decode(encoding))
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
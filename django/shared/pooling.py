@@ -0,0 +1,21 @@
+# Connection reuse modes of DB_POOL_MODE.
+DB_POOL_MODES = ('persistent', 'pool', 'none')
+
+
+def connection_reuse_settings(mode, engine, conn_max_age=60, pool=None):
+    """
+    DATABASES entry settings of a DB_POOL_MODE:
+    - persistent: each worker thread keeps its connection for conn_max_age seconds (uwsgi).
+    - pool: a bounded psycopg 3 pool per process with the given pool options (ASGI, where the
+      persistent connections are not reused). Only PostgreSQL has the pool, other databases
+      connect per request.
+    - none: one connection per request.
+    Reused connections are health checked before each request.
+    """
+    if mode not in DB_POOL_MODES:
+        raise ValueError(f'Unknown DB_POOL_MODE {mode!r}, use one of {", ".join(DB_POOL_MODES)}.')
+    if mode == 'persistent':
+        return {'CONN_HEALTH_CHECKS': True, 'CONN_MAX_AGE': conn_max_age}
+    if mode == 'pool' and 'postgresql' in engine:
+        return {'CONN_HEALTH_CHECKS': True, 'OPTIONS': {'pool': pool or True}}
+    return {'CONN_HEALTH_CHECKS': False}
@@ -0,0 +1,54 @@
+# Base imports
+import math
+from decimal import Decimal
+
+# Third party imports
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+def has_non_finite_number(data):
+    """ Whether the data holds a NaN or infinite float or Decimal, which orjson writes as null. """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(has_non_finite_number(value) for value in data.values())
+    if isinstance(data, (list, tuple, set, frozenset)):
+        return any(has_non_finite_number(value) for value in data)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson, with the same output: compact, non ASCII characters kept,
+    U+2028 and U+2029 escaped, and the types orjson does not handle the same way (dates, times,
+    Decimal, lazy strings, querysets...) encoded by DRF's encoder.
+
+    Only the floats under 1e-4 or from 1e16 are written differently, in an equivalent notation
+    (0.00001 for 1e-05). Indented output (the browsable API, 'application/json; indent=4') and the non default JSON
+    settings are rendered by JSONRenderer, as is any data orjson rejects (e.g. integers over
+    64 bits) and any data with NaN or infinite numbers, which JSONRenderer rejects or writes as
+    NaN and Infinity where orjson writes null. Those are only searched for in outputs with a null.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and has_non_finite_number(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,93 @@
+# Base imports
+import operator
+from functools import reduce
+
+# Django imports
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+# Third party imports
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+
+# The trigram indexes can only serve terms of at least one trigram.
+SEARCH_INDEX_MIN_LENGTH = 3
+
+
+def search_table_name(model):
+    """ Name of the SQLite FTS5 table indexing the search fields of a model. """
+    return f'{model._meta.db_table}_search'
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    SearchFilter for the views with ``indexed_search``, whose search fields are plain columns
+    indexed for substring search: GIN trigram indexes on PostgreSQL, which serve the ``icontains``
+    lookups as they are and rank the rows by trigram word similarity when the request has no
+    ordering, and an FTS5 trigram table on SQLite. Other views and databases keep the
+    SearchFilter behaviour.
+    """
+
+    def get_indexed_search_fields(self, view, request):
+        search_fields = self.get_search_fields(view, request)
+        if not getattr(view, 'indexed_search', False) or not search_fields:
+            return None
+        if any(LOOKUP_SEP in field or field[0] in self.lookup_prefixes for field in search_fields):
+            return None
+        return search_fields
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_indexed_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return super().filter_queryset(request, queryset, view)
+
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            queryset = super().filter_queryset(request, queryset, view)
+            if api_settings.ORDERING_PARAM not in request.query_params:
+                queryset = self.rank(queryset, search_fields, search_terms)
+            return queryset
+        if vendor == 'sqlite':
+            return self.match(queryset, search_fields, search_terms)
+        return super().filter_queryset(request, queryset, view)
+
+    @staticmethod
+    def rank(queryset, search_fields, search_terms):
+        """ Orders the rows by the sum over the terms of their best field similarity. """
+        term_ranks = []
+        for term in search_terms:
+            similarities = [TrigramWordSimilarity(term, field) for field in search_fields]
+            term_ranks.append(similarities[0] if len(similarities) == 1 else Greatest(*similarities))
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or ('pk',)
+        return queryset.annotate(
+            search_rank=reduce(operator.add, term_ranks)
+        ).order_by('-search_rank', *ordering)
+
+    @staticmethod
+    def match(queryset, search_fields, search_terms):
+        """
+        Every term must be found in one of the fields, through the FTS5 table for the terms long
+        enough to have trigrams and through ``icontains`` for the shorter ones.
+        """
+        model = queryset.model
+        table = search_table_name(model)
+        columns = ' '.join(model._meta.get_field(field).column for field in search_fields)
+        for term in search_terms:
+            if len(term) < SEARCH_INDEX_MIN_LENGTH:
+                queryset = queryset.filter(
+                    reduce(operator.or_, (Q(**{f'{field}__icontains': term}) for field in search_fields))
+                )
+                continue
+            phrase = '"{}"'.format(term.replace('"', '""'))
+            queryset = queryset.filter(pk__in=RawSQL(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+                [f'{{{columns}}}: {phrase}']
+            ))
+        return queryset
@@ -0,0 +1,35 @@
+# Base imports
+import json
+
+# Django imports
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+# Third party imports
+from rest_framework import status
+
+# Project imports
+from shared.tests import BaseAPITestCase
+
+
+class DatabaseConnectionStatsTestCase(BaseAPITestCase):
+    """Test all scenarios for the database connection stats."""
+
+    tests_to_perform = []
+
+    def test_database_connection_stats(self):
+        url = reverse('database-connection-stats')
+        self.assertEqual(self.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        opened = json.loads(self.get(url).content)['databases']['default']['connections_opened']
+        connection_created.send(sender=type(connection), connection=connection)
+
+        response = self.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = json.loads(response.content)['databases']['default']
+        self.assertEqual(stats['vendor'], 'sqlite')
+        self.assertEqual(stats['connections_opened'], opened + 1)
+        self.assertIsNone(stats['pool'])
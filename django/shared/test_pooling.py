@@ -0,0 +1,54 @@
+# Django imports
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+# Third party imports
+from psycopg_pool import ConnectionPool
+
+# Project imports
+from shared.pooling import connection_reuse_settings
+
+
+POSTGRESQL_ENGINE = 'django.db.backends.postgresql'
+POOL_OPTIONS = {'min_size': 1, 'max_size': 3, 'timeout': 5, 'max_idle': 60, 'max_lifetime': 600}
+
+
+class ConnectionReuseSettingsTestCase(SimpleTestCase):
+    """All tests for the DB_POOL_MODE connection reuse settings."""
+
+    def test_persistent(self):
+        self.assertEqual(
+            connection_reuse_settings('persistent', POSTGRESQL_ENGINE, conn_max_age=30, pool=POOL_OPTIONS),
+            {'CONN_HEALTH_CHECKS': True, 'CONN_MAX_AGE': 30}
+        )
+
+    def test_none(self):
+        self.assertEqual(
+            connection_reuse_settings('none', POSTGRESQL_ENGINE, pool=POOL_OPTIONS),
+            {'CONN_HEALTH_CHECKS': False}
+        )
+
+    def test_pool_without_postgresql(self):
+        self.assertEqual(
+            connection_reuse_settings('pool', 'django.db.backends.sqlite3', pool=POOL_OPTIONS),
+            {'CONN_HEALTH_CHECKS': False}
+        )
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            connection_reuse_settings('pgbouncer', POSTGRESQL_ENGINE)
+
+    def test_pool(self):
+        database = {'ENGINE': POSTGRESQL_ENGINE, 'NAME': 'property_rental', 'HOST': 'localhost'}
+        database.update(connection_reuse_settings('pool', POSTGRESQL_ENGINE, conn_max_age=30, pool=POOL_OPTIONS))
+        connection = ConnectionHandler({'default': database})['default']
+        # The pool is created unopened, it connects on the first request of the worker.
+        pool = connection.pool
+        try:
+            self.assertIsInstance(pool, ConnectionPool)
+            self.assertEqual((pool.min_size, pool.max_size, pool.timeout), (1, 3, 5))
+            self.assertEqual((pool.max_idle, pool.max_lifetime), (60, 600))
+            self.assertIs(pool._check, ConnectionPool.check_connection)
+            self.assertEqual(pool.get_stats()['pool_max'], 3)
+        finally:
+            connection.close_pool()
@@ -0,0 +1,102 @@
+# Django imports
+from django.core.exceptions import FieldError
+
+# Third party imports
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+
+class UnsupportedField(Exception):
+    """ A serializer field that cannot be read from values() rows. """
+
+
+class ValuesPlan:
+    """
+    Builds the output of a model serializer from the values() rows of a single joined query,
+    with one precompiled accessor per field, without instantiating models or serializers.
+
+    Supported are the plain model fields, primary key related fields, nested model serializers
+    and the method fields declared in the serializer ``values_sources``: a lookup whose value is
+    returned as is, or a (relation lookup, serializer class) pair for a nested serializer.
+    """
+
+    def __init__(self, serializer_class):
+        self.lookups = []
+        self.build_row = self._compile(serializer_class(), prefix='')
+
+    def _add_lookup(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return lookup
+
+    def _compile_nested(self, serializer, relation):
+        prefix = f'{relation}__'
+        pk_lookup = self._add_lookup(f'{prefix}{serializer.Meta.model._meta.pk.attname}')
+        build_nested = self._compile(serializer, prefix)
+
+        def build(row):
+            return None if row[pk_lookup] is None else build_nested(row)
+        return build
+
+    def _compile(self, serializer, prefix):
+        accessors = []
+        values_sources = getattr(serializer, 'values_sources', {})
+        for field_name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                source = values_sources.get(field_name)
+                if source is None:
+                    raise UnsupportedField(field_name)
+                if isinstance(source, tuple):
+                    relation, nested_serializer_class = source
+                    accessors.append((field_name, None, self._compile_nested(nested_serializer_class(), prefix + relation)))
+                else:
+                    accessors.append((field_name, self._add_lookup(prefix + source), None))
+                continue
+
+            if field.source == '*' or isinstance(field, serializers.ListSerializer):
+                raise UnsupportedField(field_name)
+            source = prefix + '__'.join(field.source_attrs)
+
+            if isinstance(field, serializers.BaseSerializer):
+                accessors.append((field_name, None, self._compile_nested(field, source)))
+            elif isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+                accessors.append((field_name, self._add_lookup(source), None))
+            elif isinstance(field, serializers.RelatedField) or isinstance(field, serializers.ManyRelatedField):
+                raise UnsupportedField(field_name)
+            else:
+                accessors.append((field_name, self._add_lookup(source), field.to_representation))
+
+        def build(row):
+            data = {}
+            for field_name, lookup, to_representation in accessors:
+                if lookup is None:
+                    data[field_name] = to_representation(row)
+                    continue
+                value = row[lookup]
+                data[field_name] = value if value is None or to_representation is None else to_representation(value)
+            return data
+        return build
+
+    def build_rows(self, rows):
+        build_row = self.build_row
+        return [build_row(row) for row in rows]
+
+
+_plans = {}
+
+
+def get_values_plan(serializer_class, model):
+    """
+    Compiled ValuesPlan of a serializer class, or None when one of its fields is not supported.
+    """
+    if serializer_class not in _plans:
+        try:
+            plan = ValuesPlan(serializer_class)
+            model._default_manager.values(*plan.lookups)
+        except (UnsupportedField, FieldError):
+            plan = None
+        _plans[serializer_class] = plan
+    return _plans[serializer_class]
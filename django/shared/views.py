@@ -1,30 +1,123 @@
+# Base imports
+import hashlib
+import json
+
 # Django imports
 import django_filters.rest_framework
-from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
 from django.db import IntegrityError
-from django.db.models import ProtectedError
-from django.http.response import Http404
+from django.db.models import Count, Max, ProtectedError
+from django.db.models.sql.datastructures import Join
+from django.conf import settings
+from django.http.response import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from drf_yasg.utils import swagger_auto_schema
 
 # Third party imports
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from rest_framework import permissions, status, viewsets
+from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError as RestFrameworkValidationError
-from rest_framework.filters import (
-    SearchFilter,
-    OrderingFilter
-)
+from rest_framework.response import Response
+from rest_framework.filters import OrderingFilter
 
 # Project imports
+from shared.cache import (
+    aget_model_versions,
+    get_model_versions,
+    get_response_cache,
+    response_cache_key,
+    response_cache_stats,
+)
+from shared.db import database_connection_stats
 from shared.helpers import (
     DefaultPaginationClass,
+    KeysetPaginationClass,
 )
 from shared.http.responses import (
     api_exception_response,
     not_found_response
 )
+from shared.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics, serializing
+from shared.search import IndexedSearchFilter
+from shared.values import get_values_plan
+
+
+def has_multivalued_join(query):
+    """ Whether the query joins a reverse foreign key or a many to many, which can repeat rows. """
+    return any(
+        isinstance(join, Join) and (join.join_field.one_to_many or join.join_field.many_to_many)
+        for join in query.alias_map.values()
+    )
+
+
+class AsyncViewSetMixin:
+    """
+    With settings.ASYNC_VIEWS, under ASGI, serves the routes of a viewset whose actions have a
+    coroutine twin named a<action> through Django's async request path. initial() (authentication,
+    permissions, throttling) and the actions without a twin run in a thread, the twins are awaited.
+    Otherwise the routes are DRF's sync views.
+    """
+    is_async_route = False
+
+    @classmethod
+    def get_async_handler_name(cls, action):
+        return f'a{action}'
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        is_async_route = settings.ASYNC_VIEWS and any(
+            iscoroutinefunction(getattr(cls, cls.get_async_handler_name(name), None))
+            for name in (actions or {}).values()
+        )
+        view = super().as_view(actions, is_async_route=is_async_route, **initkwargs)
+        if not is_async_route:
+            return view
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        async_view.__name__ = view.__name__
+        async_view.__doc__ = view.__doc__
+        async_view.__dict__.update(view.__dict__)
+        return async_view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.is_async_route:
+            return self.async_dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        """ APIView.dispatch awaiting the coroutine twins of the actions. """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            async_handler = getattr(self, self.get_async_handler_name(self.action), None) if self.action else None
+
+            if handler != self.http_method_not_allowed and iscoroutinefunction(async_handler):
+                response = await async_handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exception:
+            response = self.handle_exception(exception)
 
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
 
-class BaseCollectionViewSet(viewsets.ModelViewSet):
+
+class BaseCollectionViewSet(AsyncViewSetMixin, viewsets.ModelViewSet):
     """ Base ModelViewSet class. """
     model_class = None
     protected_error_message = None
@@ -44,19 +137,42 @@ class BaseCollectionViewSet(viewsets.ModelViewSet):
     ignore_ordering_actions = []
     ignore_search_filter_actions = []
     ignore_viewset_filters_actions = []
+    # Stable ordering ending in a unique field, enables keyset pagination when the request has a cursor.
+    keyset_ordering = None
+    # Builds the list rows from values() instead of model instances when the serializer allows it.
+    values_list_enabled = False
+    # The search fields have trigram indexes on PostgreSQL and an FTS5 table on SQLite.
+    indexed_search = False
+    # Models whose changes invalidate the cached list and retrieve responses, empty disables the cache.
+    response_cache_models = ()
+    # updated_at of the rows and of the related rows in the responses, for the conditional GETs.
+    last_modified_lookups = ('updated_at',)
 
     @property
     def paginator(self):
-        paginator = super().paginator
+        if self.use_keyset_pagination():
+            if not hasattr(self, '_keyset_paginator'):
+                self._keyset_paginator = KeysetPaginationClass(self.keyset_ordering)
+            paginator = self._keyset_paginator
+        else:
+            paginator = super().paginator
         if self.action in self.ignore_paginator_actions:
             paginator = None
         return paginator
 
+    def use_keyset_pagination(self):
+        request = getattr(self, 'request', None)
+        return bool(
+            self.keyset_ordering
+            and request is not None
+            and KeysetPaginationClass.cursor_query_param in request.query_params
+        )
+
     @property
     def filter_backends(self):
         filter_backends = [
             OrderingFilter,
-            SearchFilter,
+            IndexedSearchFilter,
             django_filters.rest_framework.DjangoFilterBackend,
         ]
         search_filter_index = 1
@@ -72,6 +188,135 @@ class BaseCollectionViewSet(viewsets.ModelViewSet):
             filter_backends.pop(viewset_filters_index)
         return filter_backends
 
+    def get_response_cache_scope(self):
+        return getattr(self.request.user, 'pk', None) or 'anonymous'
+
+    def get_cached_response(self, entry, etag):
+        """ Response from a cache entry, None when it is missing or was built from other rows than the ETag. """
+        if entry is None or (etag is not None and entry[0] != etag):
+            response_cache_stats.miss()
+            return None
+        response_cache_stats.hit()
+        response = Response(entry[1])
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def cached_response(self, build_response, etag=None):
+        """
+        Returns the cached data of the response for the action, query parameters, user scope and
+        current versions of the response_cache_models, or builds and caches it.
+
+        The data is cached with the ETag of the rows it was built from; when an ETag is given, an
+        entry built from other rows is rebuilt rather than sent under it.
+        """
+        if not self.response_cache_models:
+            return build_response()
+
+        cache = get_response_cache()
+        key = response_cache_key(self, self.request, get_model_versions(self.response_cache_models))
+        response = self.get_cached_response(cache.get(key), etag)
+        if response is None:
+            response = build_response()
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, (etag, response.data))
+            response['X-Cache'] = 'MISS'
+        return response
+
+    async def acached_response(self, build_response, etag=None):
+        """ cached_response through the async cache methods, build_response is awaited. """
+        if not self.response_cache_models:
+            return await build_response()
+
+        cache = get_response_cache()
+        key = response_cache_key(self, self.request, await aget_model_versions(self.response_cache_models))
+        response = self.get_cached_response(await cache.aget(key), etag)
+        if response is None:
+            response = await build_response()
+            if response.status_code == status.HTTP_200_OK:
+                await cache.aset(key, (etag, response.data))
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def get_object_queryset(self):
+        """ Filtered queryset of the object of a detail action, a malformed lookup is a 404 as in get_object. """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+
+    def get_conditional_aggregates(self):
+        """ Count and latest updated_at of the rows, for get_conditional_validators. """
+        return {
+            'row_count': Count('pk'),
+            **{f'last_modified_{index}': Max(lookup) for index, lookup in enumerate(self.last_modified_lookups)}
+        }
+
+    def get_conditional_validators(self, aggregates):
+        """
+        Strong ETag and Last-Modified timestamp of the rows, from the get_conditional_aggregates
+        of their queryset. The ETag also varies with the query string, e.g. the page and ordering.
+        """
+        row_count = aggregates.pop('row_count')
+        last_modified = max((value for value in aggregates.values() if value is not None), default=None)
+        etag = hashlib.sha1(json.dumps(
+            [
+                self.action,
+                self.kwargs,
+                sorted(self.request.query_params.lists()),
+                self.request.accepted_renderer.format,
+                row_count,
+                last_modified,
+            ],
+            sort_keys=True,
+            default=str
+        ).encode()).hexdigest()
+        last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+        return row_count, quote_etag(etag), last_modified_timestamp
+
+    @staticmethod
+    def add_conditional_headers(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def conditional_response(self, queryset, build_response):
+        """
+        Answers If-None-Match and If-Modified-Since with a 304 before building the response,
+        otherwise adds the ETag and Last-Modified headers to it. build_response receives the ETag,
+        so it never sends data built from other rows under it.
+        """
+        row_count, etag, last_modified = self.get_conditional_validators(
+            queryset.order_by().aggregate(**self.get_conditional_aggregates())
+        )
+        if self.action == 'retrieve' and not row_count:
+            return build_response(None)
+
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = build_response(etag)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        return self.add_conditional_headers(response, etag, last_modified)
+
+    async def aconditional_response(self, queryset, build_response):
+        """ conditional_response with the aggregate query and build_response awaited. """
+        row_count, etag, last_modified = self.get_conditional_validators(
+            await queryset.order_by().aaggregate(**self.get_conditional_aggregates())
+        )
+        if self.action == 'retrieve' and not row_count:
+            return await build_response(None)
+
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await build_response(etag)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        return self.add_conditional_headers(response, etag, last_modified)
+
     def get_serializer_class(self):
         return self.serializers.get(
             self.action,
@@ -91,19 +336,123 @@ class BaseCollectionViewSet(viewsets.ModelViewSet):
 
         except FieldDoesNotExist:
             pass
-        return queryset.distinct()
+        return queryset
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the filter backends, de-duplicating the rows only when a filter or the search joined
+        a multi-valued relation. The de-duplication is a primary key subquery, the outer query keeps
+        the ordering and the related objects of the unfiltered queryset.
+        """
+        filtered_queryset = super().filter_queryset(queryset)
+        if not has_multivalued_join(filtered_queryset.query):
+            return filtered_queryset
+
+        deduplicated_queryset = queryset.filter(pk__in=filtered_queryset.order_by().values('pk'))
+        if filtered_queryset.query.order_by:
+            deduplicated_queryset = deduplicated_queryset.order_by(*filtered_queryset.query.order_by)
+        return deduplicated_queryset
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, 'apaginate_queryset'):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(self.paginate_queryset)(queryset)
+
+    def values_list(self, values_plan):
+        queryset = self.filter_queryset(self.get_queryset()).values(*values_plan.lookups)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with serializing():
+                return self.get_paginated_response(values_plan.build_rows(page))
+
+        rows = list(queryset)
+        with serializing():
+            return Response(values_plan.build_rows(rows))
+
+    async def avalues_list(self, values_plan):
+        queryset = self.filter_queryset(self.get_queryset()).values(*values_plan.lookups)
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            with serializing():
+                return self.get_paginated_response(values_plan.build_rows(page))
+
+        rows = [row async for row in queryset]
+        with serializing():
+            return Response(values_plan.build_rows(rows))
+
+    def get_values_plan(self):
+        if not self.values_list_enabled:
+            return None
+        return get_values_plan(self.get_serializer_class(), self.model_class)
 
     @swagger_auto_schema(operation_summary="List objects")
     def list(self, request, *args, **kwargs):
+        def build_response():
+            values_plan = self.get_values_plan()
+            if values_plan is not None:
+                return self.values_list(values_plan)
+            with serializing():
+                return super(BaseCollectionViewSet, self).list(request, *args, **kwargs)
+
         try:
-            return super().list(request, *args, **kwargs)
+            return self.conditional_response(
+                self.filter_queryset(self.get_queryset()),
+                lambda etag: self.cached_response(build_response, etag)
+            )
+        except Exception as exception:
+            return api_exception_response(exception=exception)
+
+    async def alist(self, request, *args, **kwargs):
+        async def build_response():
+            values_plan = self.get_values_plan()
+            if values_plan is not None:
+                return await self.avalues_list(values_plan)
+            # Model serializers may load related objects lazily, so they run in a thread.
+            with serializing():
+                return await sync_to_async(super(BaseCollectionViewSet, self).list)(request, *args, **kwargs)
+
+        try:
+            return await self.aconditional_response(
+                self.filter_queryset(self.get_queryset()),
+                lambda etag: self.acached_response(build_response, etag)
+            )
         except Exception as exception:
             return api_exception_response(exception=exception)
 
     @swagger_auto_schema(operation_summary="Retrieve a object")
     def retrieve(self, request, *args, **kwargs):
+        def build_response():
+            instance = get_object_or_404(self.get_object_queryset())
+            self.check_object_permissions(request, instance)
+            with serializing():
+                return Response(self.get_serializer(instance).data)
+
         try:
-            return super().retrieve(request, *args, **kwargs)
+            return self.conditional_response(
+                self.get_object_queryset(),
+                lambda etag: self.cached_response(build_response, etag)
+            )
+        except Http404 as exception:
+            return not_found_response(exception)
+        except Exception as exception:
+            return api_exception_response(exception=exception)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        async def build_response():
+            instance = await aget_object_or_404(self.get_object_queryset())
+            self.check_object_permissions(request, instance)
+            with serializing():
+                return await sync_to_async(lambda: Response(self.get_serializer(instance).data))()
+
+        try:
+            return await self.aconditional_response(
+                self.get_object_queryset(),
+                lambda etag: self.acached_response(build_response, etag)
+            )
         except Http404 as exception:
             return not_found_response(exception)
         except Exception as exception:
@@ -163,3 +512,29 @@ class BaseCollectionViewSet(viewsets.ModelViewSet):
             )
         except Exception as exception:
             return api_exception_response(exception=exception)
+
+
+class ResponseCacheStatsView(APIView):
+    """ Hits and misses of the response cache in the process serving the request. """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(response_cache_stats.snapshot())
+
+
+class DatabaseConnectionStatsView(APIView):
+    """ Connection reuse and pool statistics of the process serving the request. """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(database_connection_stats())
+
+
+def metrics_view(request):
+    """
+    Metrics of the process serving the request in the Prometheus text format, for the clients in
+    METRICS_ALLOWED_IPS only.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,126 @@
+"""
+Concurrent-request throughput of the API, to compare the WSGI (uwsgi) and ASGI (uvicorn)
+deployments serving the same database:
+
+    uwsgi --http :8000 --master --enable-threads --processes 4 --threads 8 --module property_rental.wsgi
+    uvicorn property_rental.asgi:application --port 8001 --workers 4
+
+    python benchmark_concurrency.py http://127.0.0.1:8000 --token <access token> --clients 500 \
+        '/v1/properties/?page_size=50' '/v1/financial/commissions/?type=host'
+
+Each client keeps one HTTP/1.1 connection open and requests the paths in turn until the
+duration ends. The result is printed as JSON. Only the standard library is used.
+"""
+# Base imports
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def read_response(reader):
+    """ Reads one response, returns (status, keep alive). """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed.')
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def client(host, port, requests, deadline, results):
+    connection = None
+    index = 0
+    while time.perf_counter() < deadline:
+        request = requests[index % len(requests)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(host, port)
+            reader, writer = connection
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await read_response(reader)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+            results['errors'] += 1
+            connection = None
+            continue
+
+        results['latencies'].append(time.perf_counter() - start)
+        results['statuses'][status] = results['statuses'].get(status, 0) + 1
+        if not keep_alive:
+            connection[1].close()
+            connection = None
+
+    if connection is not None:
+        connection[1].close()
+
+
+async def run(base_url, paths, token, clients, duration):
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    headers = f'Host: {url.netloc}\r\nAccept: application/json\r\nConnection: keep-alive\r\n'
+    if token:
+        headers += f'Authorization: Bearer {token}\r\n'
+    requests = [f'GET {path} HTTP/1.1\r\n{headers}\r\n'.encode() for path in paths]
+
+    results = {'latencies': [], 'statuses': {}, 'errors': 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, requests, deadline, results) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(results['latencies'])
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        'url': base_url,
+        'clients': clients,
+        'duration': round(elapsed, 2),
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'p50': round(quantiles[49] * 1000, 1),
+            'p95': round(quantiles[94] * 1000, 1),
+            'p99': round(quantiles[98] * 1000, 1),
+        },
+        'statuses': results['statuses'],
+        'errors': results['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent-request throughput of the API.')
+    parser.add_argument('base_url', help='e.g. http://127.0.0.1:8000')
+    parser.add_argument('paths', nargs='+', help='Paths requested in turn by every client.')
+    parser.add_argument('--token', help='JWT access token.')
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=30)
+    arguments = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(
+        arguments.base_url, arguments.paths, arguments.token, arguments.clients, arguments.duration
+    )), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+#!/bin/sh
+
+set -e
+
+export ASYNC_VIEWS="${ASYNC_VIEWS:-True}"
+# Persistent connections are not reused under ASGI.
+export DB_POOL_MODE="${DB_POOL_MODE:-pool}"
+
+uvicorn property_rental.asgi:application --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-4}"
@@ -2,7 +2,7 @@
 
 echo "Executando testes..."
 
-python manage.py test --failfast manager authentication
+python manage.py test --failfast manager authentication shared
 
 if [ $? -ne 0 ]; then
   echo "Testes falharam. Abortando."